@@ -1,14 +1,22 @@
 """Flask应用初始化"""
-from flask import Flask, render_template
+import hashlib
+import os
+from jinja2 import FileSystemBytecodeCache
+from flask import Flask, render_template, request, make_response
 from config import DevelopmentConfig
 from app.utils.database import close_db, init_db
+from app.utils.cache import get_dashboard_stats, set_dashboard_stats, get_dashboard_stats_version
 from app.utils.logger import setup_logger, get_logger
+from app.utils.json_provider import OrjsonProvider
 from app.services.task_scheduler import TaskScheduler
 
 __version__ = '1.0.0'
 
 logger = get_logger(__name__)
 
+# 进程启动标识，避免重启后版本号归零导致浏览器误用旧的首页缓存
+_BOOT_ID = os.urandom(8).hex()
+
 
 def create_app(config=None):
     """
@@ -28,9 +36,20 @@ def create_app(config=None):
     else:
         app.config.from_object(config)
     
+    # 使用 orjson 作为 JSON 序列化实现（jsonify、request.get_json 等）
+    app.json = OrjsonProvider(app)
+    
     # 设置日志
     setup_logger(log_level=app.config.get('LOG_LEVEL', 'INFO'))
     
+    # 模板字节码缓存：编译结果落盘，进程重启后无需重新编译模板
+    jinja_cache_dir = app.config.get('JINJA_CACHE_DIR')
+    if jinja_cache_dir:
+        os.makedirs(jinja_cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=jinja_cache_dir)
+    if not app.config.get('DEBUG'):
+        app.jinja_env.auto_reload = False
+    
     # 注册数据库关闭函数
     app.teardown_appcontext(close_db)
     
@@ -40,32 +59,53 @@ def create_app(config=None):
     # 注册主页路由
     @app.route('/')
     def index():
-        from app.services.project_service import ProjectService
-        try:
-            projects = ProjectService.get_all_projects()
-            total_projects = len(projects)
-            completed_projects = sum(1 for p in projects if p.status == 'completed')
-            processing_projects = sum(1 for p in projects if p.status in ['processing', 'pending'])
-            failed_projects = sum(1 for p in projects if p.status == 'failed')
-            
-            stats = {
-                'total_projects': total_projects,
-                'completed_projects': completed_projects,
-                'processing_projects': processing_projects,
-                'failed_projects': failed_projects,
-                'recent_projects': projects[:5] if projects else []
-            }
-        except Exception as e:
-            logger.error(f'获取首页统计信息失败: {str(e)}')
-            stats = {
-                'total_projects': 0,
-                'completed_projects': 0,
-                'processing_projects': 0,
-                'failed_projects': 0,
-                'recent_projects': []
-            }
+        from app.models.project import Project
         
-        return render_template('dashboard.html', stats=stats)
+        # 以统计信息版本号生成ETag，数据未变化时直接返回304
+        version = get_dashboard_stats_version()
+        etag = hashlib.blake2b(f'{_BOOT_ID}:{version}'.encode(), digest_size=8).hexdigest()
+        if etag in request.if_none_match:
+            response = make_response('', 304)
+            response.set_etag(etag)
+            return response
+        
+        # 优先使用缓存的统计信息，避免每次刷新首页都查询数据库
+        stats = get_dashboard_stats()
+        if stats is None:
+            try:
+                # 由数据库聚合各状态的项目数，仅加载最近的5个项目
+                status_counts = Project.get_status_counts()
+                
+                stats = {
+                    'total_projects': sum(status_counts.values()),
+                    'completed_projects': status_counts[Project.STATUS_COMPLETED],
+                    'processing_projects': status_counts[Project.STATUS_PROCESSING]
+                                           + status_counts[Project.STATUS_PENDING],
+                    'failed_projects': status_counts[Project.STATUS_FAILED],
+                    'recent_projects': Project.get_recent(5)
+                }
+                set_dashboard_stats(stats, version)
+            except Exception as e:
+                logger.error(f'获取首页统计信息失败: {str(e)}')
+                stats = {
+                    'total_projects': 0,
+                    'completed_projects': 0,
+                    'processing_projects': 0,
+                    'failed_projects': 0,
+                    'recent_projects': []
+                }
+                # 统计失败时不设置ETag，避免浏览器缓存错误结果
+                return render_template('dashboard.html', stats=stats)
+        
+        response = make_response(render_template('dashboard.html', stats=stats))
+        response.set_etag(etag)
+        # 每次都向服务端校验ETag，保证项目变更后首页立即刷新
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    
+    # 预加载首页模板，避免首个请求承担模板编译开销
+    app.jinja_env.get_template('dashboard.html')
+    app.jinja_env.get_template('base.html')
     
     # 错误处理
     @app.errorhandler(404)
@@ -1,10 +1,15 @@
 """项目模型"""
 import os
-import json
+import orjson
+from collections import Counter
 from datetime import datetime
-from app.utils.database import execute_query
+from app.utils.database import execute_query, execute_many
+from app.utils.cache import invalidate_dashboard_stats, project_cache
 from config import DefaultConfig
 
+# 输出根目录（模块加载时确定）
+_OUTPUT_DIR = DefaultConfig.OUTPUT_DIR
+
 
 class Project:
     """项目数据模型"""
@@ -16,6 +21,24 @@ class Project:
     STATUS_FAILED = 'failed'
     STATUS_CANCELLED = 'cancelled'
     
+    # 查询列（顺序与构造函数参数一致）
+    _COLUMNS = 'id, name, description, created_at, updated_at, status, output_path, config_json'
+    # 列表查询使用的精简列（不包含 config_json）
+    _LITE_COLUMNS = 'id, name, description, created_at, updated_at, status, output_path'
+    
+    # project_stats 汇总表中的统计列
+    _SEGMENT_STATS_KEYS = ('total_segments', 'completed_segments', 'pending_segments', 'failed_segments',
+                           'total_words', 'total_video_segments', 'completed_video_segments',
+                           'pending_video_segments')
+    _Q_GET_SEGMENT_STATS = (f"SELECT {', '.join(_SEGMENT_STATS_KEYS)} FROM project_stats "
+                            'WHERE project_id = ? LIMIT 1')
+    _Q_GET_AUDIO_PROGRESS_BY_STATUS = ('SELECT p.id, COALESCE(s.total_segments, 0), COALESCE(s.completed_segments, 0) '
+                                       'FROM projects p LEFT JOIN project_stats s ON s.project_id = p.id '
+                                       'WHERE p.status = ?')
+    
+    __slots__ = ('id', 'name', 'description', 'created_at', 'updated_at', 'status',
+                 'output_path', '_config_json', '_config_cache', '_abs_output_path')
+    
     def __init__(self, id=None, name=None, description=None, created_at=None,
                  updated_at=None, status=STATUS_PENDING, output_path=None, config_json=None):
         self.id = id
@@ -25,19 +48,42 @@ class Project:
         self.updated_at = updated_at
         self.status = status
         self.output_path = output_path
-        self.config_json = config_json
+        self._config_json = config_json
+        # 解析后的配置缓存，首次访问 config 时才解析
+        self._config_cache = None
+        # 绝对输出路径缓存
+        self._abs_output_path = None
+    
+    @property
+    def config_json(self):
+        """获取配置JSON字符串"""
+        return self._config_json
+    
+    @config_json.setter
+    def config_json(self, value):
+        """设置配置JSON字符串，并使已解析的配置失效"""
+        self._config_json = value
+        self._config_cache = None
     
     @property
     def config(self):
-        """获取配置字典"""
-        if self.config_json:
-            return json.loads(self.config_json)
-        return {}
+        """
+        获取配置字典
+        
+        首次访问时解析 config_json 并缓存在实例上，
+        修改返回的字典后需重新赋值给 config 才会同步到 config_json
+        """
+        if self._config_cache is None and self._config_json:
+            self._config_cache = orjson.loads(self._config_json)
+        if self._config_cache is None:
+            return {}
+        return self._config_cache
     
     @config.setter
     def config(self, value):
         """设置配置字典"""
-        self.config_json = json.dumps(value, ensure_ascii=False)
+        self._config_json = orjson.dumps(value).decode('utf-8')
+        self._config_cache = value
     
     @classmethod
     def create(cls, name, description, output_path, config):
@@ -51,22 +97,25 @@ class Project:
             config: 配置字典
             
         Returns:
-            项目ID
+            新建的项目对象
         """
-        config_json = json.dumps(config, ensure_ascii=False)
+        config_json = orjson.dumps(config).decode('utf-8')
         
-        query = '''
+        # 插入并直接返回新行，避免再查询一次
+        query = f'''
             INSERT INTO projects (name, description, output_path, config_json)
             VALUES (?, ?, ?, ?)
+            RETURNING {cls._COLUMNS}
         '''
         
-        project_id = execute_query(
+        row = execute_query(
             query,
             (name, description, output_path, config_json),
-            fetch=False
+            fetch='one'
         )
+        invalidate_dashboard_stats()
         
-        return project_id
+        return cls._from_row(row)
     
     @classmethod
     def get_by_id(cls, project_id):
@@ -79,11 +128,11 @@ class Project:
         Returns:
             Project对象或None
         """
-        query = 'SELECT * FROM projects WHERE id = ?'
-        rows = execute_query(query, (project_id,))
+        query = f'SELECT {cls._COLUMNS} FROM projects WHERE id = ? LIMIT 1'
+        row = execute_query(query, (project_id,), fetch='one')
         
-        if rows:
-            return cls._from_row(rows[0])
+        if row:
+            return cls._from_row(row)
         return None
     
     @classmethod
@@ -97,11 +146,11 @@ class Project:
         Returns:
             Project对象或None
         """
-        query = 'SELECT * FROM projects WHERE name = ?'
-        rows = execute_query(query, (name,))
+        query = f'SELECT {cls._COLUMNS} FROM projects WHERE name = ? LIMIT 1'
+        row = execute_query(query, (name,), fetch='one')
         
-        if rows:
-            return cls._from_row(rows[0])
+        if row:
+            return cls._from_row(row)
         return None
     
     @classmethod
@@ -112,11 +161,83 @@ class Project:
         Returns:
             Project对象列表
         """
-        query = 'SELECT * FROM projects ORDER BY created_at DESC'
+        query = f'SELECT {cls._COLUMNS} FROM projects ORDER BY created_at DESC'
         rows = execute_query(query)
         
         return [cls._from_row(row) for row in rows]
     
+    @classmethod
+    def iter_all_lite(cls):
+        """
+        逐行遍历所有项目（不加载配置，不一次性加载全部结果）
+        
+        查询在调用时立即执行，查询错误由调用方捕获，而不是在流式渲染途中才抛出
+        
+        Returns:
+            Project对象迭代器
+        """
+        query = f'SELECT {cls._LITE_COLUMNS} FROM projects ORDER BY created_at DESC'
+        cursor = execute_query(query, fetch='iter')
+        return (cls._from_row(row) for row in cursor)
+    
+    @classmethod
+    def get_recent(cls, limit=5):
+        """
+        获取最近创建的项目（不加载配置）
+        
+        Args:
+            limit: 限制数量
+            
+        Returns:
+            Project对象列表
+        """
+        query = f'SELECT {cls._LITE_COLUMNS} FROM projects ORDER BY created_at DESC LIMIT ?'
+        rows = execute_query(query, (limit,))
+        
+        return [cls._from_row(row) for row in rows]
+    
+    @classmethod
+    def get_status_counts(cls):
+        """
+        按状态统计项目数量
+        
+        Returns:
+            Counter({状态: 项目数})，不存在的状态计数为0
+        """
+        query = 'SELECT status, COUNT(*) FROM projects GROUP BY status'
+        rows = execute_query(query)
+        
+        return Counter(dict(rows))
+    
+    @classmethod
+    def get_segment_stats(cls, project_id):
+        """
+        获取项目的段落与视频片段统计（读取由触发器维护的 project_stats 汇总行）
+        
+        Args:
+            project_id: 项目ID
+            
+        Returns:
+            统计信息字典，项目尚无段落时各项均为0
+        """
+        row = execute_query(cls._Q_GET_SEGMENT_STATS, (project_id,), fetch='one')
+        if row is None:
+            return dict.fromkeys(cls._SEGMENT_STATS_KEYS, 0)
+        return dict(zip(cls._SEGMENT_STATS_KEYS, row))
+    
+    @classmethod
+    def get_audio_progress_by_status(cls, status):
+        """
+        获取指定状态的所有项目的段落总数与音频已完成段落数（单次查询）
+        
+        Args:
+            status: 项目状态
+            
+        Returns:
+            (项目ID, 段落总数, 音频已完成段落数) 元组列表
+        """
+        return execute_query(cls._Q_GET_AUDIO_PROGRESS_BY_STATUS, (status,))
+    
     @classmethod
     def update_status(cls, project_id, status):
         """
@@ -132,6 +253,52 @@ class Project:
             WHERE id = ?
         '''
         execute_query(query, (status, project_id), fetch=False)
+        project_cache.pop(project_id)
+        invalidate_dashboard_stats()
+    
+    @classmethod
+    def bulk_update_status(cls, updates):
+        """
+        批量更新项目状态（单个事务）
+        
+        Args:
+            updates: (项目ID, 新状态) 元组列表
+        
+        Returns:
+            影响的行数
+        """
+        if not updates:
+            return 0
+        
+        query = '''
+            UPDATE projects 
+            SET status = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        '''
+        count = execute_many(query, [(status, project_id) for project_id, status in updates])
+        for project_id, _ in updates:
+            project_cache.pop(project_id)
+        invalidate_dashboard_stats()
+        return count
+    
+    @classmethod
+    def update_config(cls, project_id, config):
+        """
+        更新项目配置
+        
+        Args:
+            project_id: 项目ID
+            config: 配置字典
+        """
+        query = '''
+            UPDATE projects 
+            SET config_json = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        '''
+        execute_query(query, (orjson.dumps(config).decode('utf-8'), project_id), fetch=False)
+        project_cache.pop(project_id)
+        # 首页ETag依赖统计信息版本号，任何项目写入都需要递增
+        invalidate_dashboard_stats()
     
     @classmethod
     def delete(cls, project_id):
@@ -143,6 +310,8 @@ class Project:
         """
         query = 'DELETE FROM projects WHERE id = ?'
         execute_query(query, (project_id,), fetch=False)
+        project_cache.pop(project_id)
+        invalidate_dashboard_stats()
     
     @staticmethod
     def convert_to_relative_path(absolute_path):
@@ -182,7 +351,7 @@ class Project:
             return relative_path
         
         # 拼接到 output 目录
-        return os.path.join(DefaultConfig.OUTPUT_DIR, relative_path)
+        return os.path.join(_OUTPUT_DIR, relative_path)
     
     def get_absolute_output_path(self):
         """
@@ -194,12 +363,14 @@ class Project:
         if not self.output_path:
             return None
         
-        # 如果已经是绝对路径，直接返回
-        if os.path.isabs(self.output_path):
-            return self.output_path
+        if self._abs_output_path is None:
+            # 如果已经是绝对路径，直接使用；否则拼接到 output 目录
+            if os.path.isabs(self.output_path):
+                self._abs_output_path = self.output_path
+            else:
+                self._abs_output_path = os.path.join(_OUTPUT_DIR, self.output_path)
         
-        # 拼接到 output 目录
-        return os.path.join(DefaultConfig.OUTPUT_DIR, self.output_path)
+        return self._abs_output_path
     
     @classmethod
     def _from_row(cls, row):
@@ -207,21 +378,12 @@ class Project:
         从数据库行创建对象
         
         Args:
-            row: 数据库行
+            row: 按 _COLUMNS 或 _LITE_COLUMNS 顺序查询的数据库行
             
         Returns:
             Project对象
         """
-        return cls(
-            id=row['id'],
-            name=row['name'],
-            description=row['description'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at'],
-            status=row['status'],
-            output_path=row['output_path'],
-            config_json=row['config_json']
-        )
+        return cls(*row)
     
     def to_dict(self):
         """
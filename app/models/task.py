@@ -1,6 +1,13 @@
 """任务模型"""
+import threading
+import time
 from datetime import datetime
-from app.utils.database import execute_query
+from app.utils.database import execute_query, execute_many, execute_write
+
+
+# 进度写入节流状态: {任务ID: [已写入进度, 写入时间, 待写入进度或None]}
+_progress_state = {}
+_progress_lock = threading.Lock()
 
 
 class Task:
@@ -19,6 +26,21 @@ class Task:
     STATUS_FAILED = 'failed'
     STATUS_CANCELLED = 'cancelled'
     
+    # 进度写入节流阈值：进度变化不小于该值或距上次写入超过该时间(秒)才写库
+    PROGRESS_MIN_DELTA = 1.0
+    PROGRESS_MIN_INTERVAL = 0.5
+    
+    # 查询列（顺序与构造函数参数一致）
+    _COLUMNS = ('id, project_id, task_type, status, progress, error_message, '
+                'started_at, completed_at, created_at')
+    _Q_GET_BY_PROJECT = f'SELECT {_COLUMNS} FROM tasks WHERE project_id = ? ORDER BY created_at DESC'
+    _Q_GET_RUNNING = f'SELECT {_COLUMNS} FROM tasks WHERE status = ? ORDER BY started_at'
+    _Q_GET_BY_TYPE_AND_STATUS = f'SELECT {_COLUMNS} FROM tasks WHERE task_type = ? AND status = ?'
+    _Q_HAS_ACTIVE = 'SELECT 1 FROM tasks WHERE project_id = ? AND task_type = ? AND status IN (?, ?) LIMIT 1'
+    
+    __slots__ = ('id', 'project_id', 'task_type', 'status', 'progress', 'error_message',
+                 'started_at', 'completed_at', 'created_at')
+    
     def __init__(self, id=None, project_id=None, task_type=None, status=STATUS_PENDING,
                  progress=0.0, error_message=None, started_at=None, completed_at=None,
                  created_at=None):
@@ -42,20 +64,21 @@ class Task:
             task_type: 任务类型
             
         Returns:
-            任务ID
+            新建的任务对象
         """
-        query = '''
+        query = f'''
             INSERT INTO tasks (project_id, task_type, status)
             VALUES (?, ?, ?)
+            RETURNING {cls._COLUMNS}
         '''
         
-        task_id = execute_query(
+        row = execute_query(
             query,
             (project_id, task_type, cls.STATUS_PENDING),
-            fetch=False
+            fetch='one'
         )
         
-        return task_id
+        return cls._from_row(row)
     
     @classmethod
     def get_by_id(cls, task_id):
@@ -68,11 +91,11 @@ class Task:
         Returns:
             Task对象或None
         """
-        query = 'SELECT * FROM tasks WHERE id = ?'
-        rows = execute_query(query, (task_id,))
+        query = f'SELECT {cls._COLUMNS} FROM tasks WHERE id = ? LIMIT 1'
+        row = execute_query(query, (task_id,), fetch='one')
         
-        if rows:
-            return cls._from_row(rows[0])
+        if row:
+            return cls._from_row(row)
         return None
     
     @classmethod
@@ -86,15 +109,25 @@ class Task:
         Returns:
             Task对象列表
         """
-        query = '''
-            SELECT * FROM tasks 
-            WHERE project_id = ? 
-            ORDER BY created_at DESC
-        '''
-        rows = execute_query(query, (project_id,))
+        rows = execute_query(cls._Q_GET_BY_PROJECT, (project_id,))
         
         return [cls._from_row(row) for row in rows]
     
+    @classmethod
+    def get_by_project_as_dicts(cls, project_id):
+        """
+        获取项目的所有任务（直接返回字典，不构造Task对象）
+        
+        Args:
+            project_id: 项目ID
+            
+        Returns:
+            任务信息字典列表，格式同 to_dict
+        """
+        rows = execute_query(cls._Q_GET_BY_PROJECT, (project_id,))
+        
+        return [dict(row) for row in rows]
+    
     @classmethod
     def update_status(cls, task_id, status, error_message=None):
         """
@@ -105,13 +138,17 @@ class Task:
             status: 新状态
             error_message: 错误信息
         """
+        if status in [cls.STATUS_COMPLETED, cls.STATUS_FAILED, cls.STATUS_CANCELLED]:
+            # 任务结束前写入被节流的最终进度
+            cls.flush_progress(task_id)
+        
         if status == cls.STATUS_RUNNING:
             query = '''
                 UPDATE tasks 
                 SET status = ?, started_at = CURRENT_TIMESTAMP
                 WHERE id = ?
             '''
-            execute_query(query, (status, task_id), fetch=False)
+            execute_write(query, (status, task_id))
         elif status in [cls.STATUS_COMPLETED, cls.STATUS_FAILED, cls.STATUS_CANCELLED]:
             if error_message:
                 query = '''
@@ -119,29 +156,136 @@ class Task:
                     SET status = ?, completed_at = CURRENT_TIMESTAMP, error_message = ?
                     WHERE id = ?
                 '''
-                execute_query(query, (status, error_message, task_id), fetch=False)
+                execute_write(query, (status, error_message, task_id))
             else:
                 query = '''
                     UPDATE tasks 
                     SET status = ?, completed_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 '''
-                execute_query(query, (status, task_id), fetch=False)
+                execute_write(query, (status, task_id))
         else:
             query = 'UPDATE tasks SET status = ? WHERE id = ?'
-            execute_query(query, (status, task_id), fetch=False)
+            execute_write(query, (status, task_id))
     
     @classmethod
     def update_progress(cls, task_id, progress):
         """
         更新任务进度
         
+        进度变化小于 PROGRESS_MIN_DELTA 且距上次写入不足 PROGRESS_MIN_INTERVAL 秒时
+        仅记录待写入进度，不写数据库；0 和 100 总是立即写入
+        
         Args:
             task_id: 任务ID
             progress: 进度(0-100)
         """
+        now = time.monotonic()
+        with _progress_lock:
+            state = _progress_state.get(task_id)
+            if state is not None and progress not in (0.0, 100.0):
+                last_progress, last_ts, _ = state
+                if abs(progress - last_progress) < cls.PROGRESS_MIN_DELTA and \
+                   now - last_ts < cls.PROGRESS_MIN_INTERVAL:
+                    state[2] = progress
+                    return
+            _progress_state[task_id] = [progress, now, None]
+        
         query = 'UPDATE tasks SET progress = ? WHERE id = ?'
-        execute_query(query, (progress, task_id), fetch=False)
+        execute_write(query, (progress, task_id))
+    
+    @classmethod
+    def flush_progress(cls, task_id):
+        """
+        写入被节流的待写入进度并清除节流状态
+        
+        Args:
+            task_id: 任务ID
+        """
+        with _progress_lock:
+            state = _progress_state.pop(task_id, None)
+        
+        if state is not None and state[2] is not None:
+            query = 'UPDATE tasks SET progress = ? WHERE id = ?'
+            execute_write(query, (state[2], task_id))
+    
+    @classmethod
+    def bulk_update_status(cls, updates):
+        """
+        批量更新任务状态（单个事务）
+        
+        与 update_status 语义一致：running 状态记录开始时间，
+        completed/failed/cancelled 状态记录完成时间，错误信息为空时保留原值
+        
+        Args:
+            updates: (任务ID, 新状态, 错误信息) 元组列表，错误信息可为None
+            
+        Returns:
+            影响的行数
+        """
+        if not updates:
+            return 0
+        
+        query = '''
+            UPDATE tasks 
+            SET status = ?,
+                started_at = CASE WHEN ? = ? THEN CURRENT_TIMESTAMP ELSE started_at END,
+                completed_at = CASE WHEN ? IN (?, ?, ?) THEN CURRENT_TIMESTAMP ELSE completed_at END,
+                error_message = COALESCE(?, error_message)
+            WHERE id = ?
+        '''
+        params_list = [
+            (status, status, cls.STATUS_RUNNING,
+             status, cls.STATUS_COMPLETED, cls.STATUS_FAILED, cls.STATUS_CANCELLED,
+             error_message, task_id)
+            for task_id, status, error_message in updates
+        ]
+        return execute_many(query, params_list)
+    
+    @classmethod
+    def iter_running_tasks(cls):
+        """
+        逐行遍历所有运行中的任务（不一次性加载全部结果）
+        
+        Yields:
+            Task对象
+        """
+        for row in execute_query(cls._Q_GET_RUNNING, (cls.STATUS_RUNNING,), fetch='iter'):
+            yield cls._from_row(row)
+    
+    @classmethod
+    def iter_by_type_and_status(cls, task_type, status):
+        """
+        逐行遍历指定类型和状态的任务
+        
+        Args:
+            task_type: 任务类型
+            status: 任务状态
+            
+        Yields:
+            Task对象
+        """
+        for row in execute_query(cls._Q_GET_BY_TYPE_AND_STATUS, (task_type, status), fetch='iter'):
+            yield cls._from_row(row)
+    
+    @classmethod
+    def has_active_task(cls, project_id, task_type):
+        """
+        检查项目是否有待处理或运行中的指定类型任务
+        
+        Args:
+            project_id: 项目ID
+            task_type: 任务类型
+            
+        Returns:
+            是否存在未结束的任务
+        """
+        row = execute_query(
+            cls._Q_HAS_ACTIVE,
+            (project_id, task_type, cls.STATUS_PENDING, cls.STATUS_RUNNING),
+            fetch='one'
+        )
+        return row is not None
     
     @classmethod
     def get_running_tasks(cls):
@@ -151,10 +295,19 @@ class Task:
         Returns:
             Task对象列表
         """
-        query = 'SELECT * FROM tasks WHERE status = ? ORDER BY started_at'
-        rows = execute_query(query, (cls.STATUS_RUNNING,))
+        return list(cls.iter_running_tasks())
+    
+    @classmethod
+    def get_running_tasks_as_dicts(cls):
+        """
+        获取所有运行中的任务（直接返回字典，不构造Task对象）
         
-        return [cls._from_row(row) for row in rows]
+        Returns:
+            任务信息字典列表，格式同 to_dict
+        """
+        rows = execute_query(cls._Q_GET_RUNNING, (cls.STATUS_RUNNING,))
+        
+        return [dict(row) for row in rows]
     
     @classmethod
     def _from_row(cls, row):
@@ -162,22 +315,12 @@ class Task:
         从数据库行创建对象
         
         Args:
-            row: 数据库行
+            row: 按 _COLUMNS 顺序查询的数据库行
             
         Returns:
             Task对象
         """
-        return cls(
-            id=row['id'],
-            project_id=row['project_id'],
-            task_type=row['task_type'],
-            status=row['status'],
-            progress=row['progress'],
-            error_message=row['error_message'],
-            started_at=row['started_at'],
-            completed_at=row['completed_at'],
-            created_at=row['created_at']
-        )
+        return cls(*row)
     
     def to_dict(self):
         """
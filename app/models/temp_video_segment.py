@@ -1,5 +1,10 @@
 """临时视频片段模型"""
-from app.utils.database import execute_query
+import os
+from app.utils.database import execute_query, execute_write
+from config import DefaultConfig
+
+# 临时视频根目录（模块加载时确定）
+_TEMP_VIDEO_DIR = DefaultConfig.TEMP_VIDEO_DIR
 
 
 class TempVideoSegment:
@@ -11,6 +16,12 @@ class TempVideoSegment:
     STATUS_MERGED = 'merged'  # 已合成最终视频
     STATUS_DELETED = 'deleted'  # 已删除
     
+    # 查询列（顺序与构造函数参数一致）
+    _COLUMNS = 'id, project_id, text_segment_id, temp_video_path, status, created_at, updated_at'
+    
+    __slots__ = ('id', 'project_id', 'text_segment_id', 'temp_video_path', 'status',
+                 'created_at', 'updated_at', '_abs_temp_video_path')
+    
     def __init__(self, id=None, project_id=None, text_segment_id=None, temp_video_path=None,
                  status=STATUS_PENDING, created_at=None, updated_at=None):
         self.id = id
@@ -20,6 +31,8 @@ class TempVideoSegment:
         self.status = status
         self.created_at = created_at
         self.updated_at = updated_at
+        # 绝对临时视频路径缓存
+        self._abs_temp_video_path = None
     
     @classmethod
     def create(cls, project_id, text_segment_id, temp_video_path):
@@ -32,21 +45,22 @@ class TempVideoSegment:
             temp_video_path: 临时视频路径
             
         Returns:
-            临时视频片段ID
+            新建的临时视频片段对象
         """
-        query = '''
+        query = f'''
             INSERT INTO temp_video_segments 
             (project_id, text_segment_id, temp_video_path, status)
             VALUES (?, ?, ?, ?)
+            RETURNING {cls._COLUMNS}
         '''
         
-        segment_id = execute_query(
+        row = execute_query(
             query,
             (project_id, text_segment_id, temp_video_path, cls.STATUS_PENDING),
-            fetch=False
+            fetch='one'
         )
         
-        return segment_id
+        return cls._from_row(row)
     
     @classmethod
     def get_by_id(cls, segment_id):
@@ -59,18 +73,12 @@ class TempVideoSegment:
         Returns:
             TempVideoSegment对象或None
         """
-        query = 'SELECT * FROM temp_video_segments WHERE id = ?'
-        rows = execute_query(query, (segment_id,))
+        query = f'SELECT {cls._COLUMNS} FROM temp_video_segments WHERE id = ? LIMIT 1'
+        row = execute_query(query, (segment_id,), fetch='one')
         
-        if not rows:
-            return None
-        try:
-            first = rows[0] if isinstance(rows, (list, tuple)) and rows else None
-        except Exception:
-            first = None
-        if first is None:
+        if row is None:
             return None
-        return cls._from_row(first)
+        return cls._from_row(row)
     
     @classmethod
     def get_by_project(cls, project_id):
@@ -83,14 +91,12 @@ class TempVideoSegment:
         Returns:
             TempVideoSegment对象列表
         """
-        query = '''
-            SELECT * FROM temp_video_segments 
+        query = f'''
+            SELECT {cls._COLUMNS} FROM temp_video_segments 
             WHERE project_id = ? 
             ORDER BY id
         '''
         rows = execute_query(query, (project_id,))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
         return [cls._from_row(row) for row in rows]
     
     @classmethod
@@ -104,14 +110,12 @@ class TempVideoSegment:
         Returns:
             TempVideoSegment对象或None
         """
-        query = 'SELECT * FROM temp_video_segments WHERE text_segment_id = ?'
-        rows = execute_query(query, (text_segment_id,))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
+        query = f'SELECT {cls._COLUMNS} FROM temp_video_segments WHERE text_segment_id = ? LIMIT 1'
+        row = execute_query(query, (text_segment_id,), fetch='one')
         
-        if len(rows) > 0:
-            return cls._from_row(rows[0])
-        return None
+        if row is None:
+            return None
+        return cls._from_row(row)
     
     @classmethod
     def get_by_status(cls, project_id, status):
@@ -125,14 +129,12 @@ class TempVideoSegment:
         Returns:
             TempVideoSegment对象列表
         """
-        query = '''
-            SELECT * FROM temp_video_segments 
+        query = f'''
+            SELECT {cls._COLUMNS} FROM temp_video_segments 
             WHERE project_id = ? AND status = ?
             ORDER BY id
         '''
         rows = execute_query(query, (project_id, status))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
         return [cls._from_row(row) for row in rows]
     
     @classmethod
@@ -145,7 +147,7 @@ class TempVideoSegment:
             status: 新状态
         """
         query = 'UPDATE temp_video_segments SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?'
-        execute_query(query, (status, segment_id), fetch=False)
+        execute_write(query, (status, segment_id))
     
     @classmethod
     def delete(cls, segment_id):
@@ -163,20 +165,12 @@ class TempVideoSegment:
         从数据库行创建对象
         
         Args:
-            row: 数据库行
+            row: 按 _COLUMNS 顺序查询的数据库行
             
         Returns:
             TempVideoSegment对象
         """
-        return cls(
-            id=row['id'],
-            project_id=row['project_id'],
-            text_segment_id=row['text_segment_id'],
-            temp_video_path=row['temp_video_path'],
-            status=row['status'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
-        )
+        return cls(*row)
     
     def get_absolute_temp_video_path(self):
         """
@@ -185,15 +179,14 @@ class TempVideoSegment:
         Returns:
             绝对路径
         """
-        import os
-        from config import DefaultConfig
-        
-        # 如果 temp_video_path 已经是绝对路径，直接返回
-        if os.path.isabs(self.temp_video_path):
-            return self.temp_video_path
+        if self._abs_temp_video_path is None:
+            # 如果 temp_video_path 已经是绝对路径，直接使用；否则以 TEMP_VIDEO_DIR 为基础路径
+            if os.path.isabs(self.temp_video_path):
+                self._abs_temp_video_path = self.temp_video_path
+            else:
+                self._abs_temp_video_path = os.path.join(_TEMP_VIDEO_DIR, self.temp_video_path)
         
-        # 否则以 TEMP_VIDEO_DIR 为基础路径
-        return os.path.join(DefaultConfig.TEMP_VIDEO_DIR, self.temp_video_path)
+        return self._abs_temp_video_path
     
     def to_dict(self):
         """
@@ -1,9 +1,70 @@
 """文本段落模型"""
 import os
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from app.utils.database import execute_query, execute_many
+from app.utils.database import execute_query, execute_many, get_db
 from config import DefaultConfig
 
+# 临时音频根目录（模块加载时确定）
+_TEMP_AUDIO_DIR = DefaultConfig.TEMP_AUDIO_DIR
+
+# 查询列（顺序与构造函数参数一致）
+_COLUMNS = ('id, project_id, segment_index, content, word_count, chapter_title, '
+            'audio_status, audio_path, audio_duration, created_at')
+# 列表查询使用的精简列：content 只取预览所需的前101个字符（to_dict 截断为100字符加省略号）
+_LITE_COLUMNS = ('id, project_id, segment_index, substr(content, 1, 101) AS content, word_count, '
+                 'chapter_title, audio_status, audio_path, audio_duration, created_at')
+
+# 常用SQL语句（固定文本，保证命中连接的预编译语句缓存）
+_INSERT_PREFIX = '''
+    INSERT INTO text_segments 
+    (project_id, segment_index, content, word_count, chapter_title)
+    VALUES '''
+_INSERT_ROW = '(?, ?, ?, ?, ?)'
+_Q_INSERT = _INSERT_PREFIX + _INSERT_ROW
+# 批量插入时每条 INSERT 语句包含的行数（5列 × 100行 = 500个参数，低于SQLite默认上限999）
+_INSERT_CHUNK_SIZE = 100
+_Q_INSERT_CHUNK = _INSERT_PREFIX + ', '.join([_INSERT_ROW] * _INSERT_CHUNK_SIZE)
+_Q_GET_BY_ID = f'SELECT {_COLUMNS} FROM text_segments WHERE id = ? LIMIT 1'
+_Q_GET_BY_PROJECT = f'''
+    SELECT {_COLUMNS} FROM text_segments 
+    WHERE project_id = ? 
+    ORDER BY segment_index
+'''
+_Q_GET_BY_PROJECT_LITE = f'''
+    SELECT {_LITE_COLUMNS} FROM text_segments 
+    WHERE project_id = ? 
+    ORDER BY segment_index
+'''
+# 子查询按段落索引排序后由 GROUP_CONCAT 拼接（SQLite 按子查询输出顺序聚合）
+_Q_CONCAT_CONTENT_BY_PROJECT = '''
+    SELECT GROUP_CONCAT(content, ?) FROM (
+        SELECT content FROM text_segments 
+        WHERE project_id = ? AND content IS NOT NULL AND content <> '' 
+        ORDER BY segment_index
+    )
+'''
+# LIMIT 参数化，传入 -1 表示不限制数量
+_Q_GET_BY_STATUS = f'''
+    SELECT {_COLUMNS} FROM text_segments 
+    WHERE project_id = ? AND audio_status = ? 
+    ORDER BY segment_index
+    LIMIT ?
+'''
+_Q_GET_AUDIO_SUMMARY = '''
+    SELECT COUNT(*), COALESCE(SUM(audio_duration), 0)
+    FROM text_segments 
+    WHERE project_id = ? AND audio_status = ?
+'''
+# 音频路径/时长传入 NULL 时保留原值
+_Q_UPDATE_AUDIO_STATUS = '''
+    UPDATE text_segments 
+    SET audio_status = ?, audio_path = COALESCE(?, audio_path), 
+        audio_duration = COALESCE(?, audio_duration)
+    WHERE id = ?
+'''
+
 
 class TextSegment:
     """文本段落数据模型"""
@@ -14,6 +75,9 @@ class TextSegment:
     AUDIO_STATUS_COMPLETED = 'completed'
     AUDIO_STATUS_FAILED = 'failed'
     
+    __slots__ = ('id', 'project_id', 'segment_index', 'content', 'word_count', 'chapter_title',
+                 'audio_status', 'audio_path', 'audio_duration', 'created_at', '_content_preview')
+    
     def __init__(self, id=None, project_id=None, segment_index=None, content=None,
                  word_count=None, chapter_title=None, audio_status=AUDIO_STATUS_PENDING,
                  audio_path=None, audio_duration=None, created_at=None):
@@ -27,6 +91,8 @@ class TextSegment:
         self.audio_path = audio_path
         self.audio_duration = audio_duration
         self.created_at = created_at
+        # 内容预览缓存，首次调用 to_dict 时生成
+        self._content_preview = None
     
     @classmethod
     def create(cls, project_id, segment_index, content, word_count, chapter_title=None):
@@ -43,14 +109,8 @@ class TextSegment:
         Returns:
             段落ID
         """
-        query = '''
-            INSERT INTO text_segments 
-            (project_id, segment_index, content, word_count, chapter_title)
-            VALUES (?, ?, ?, ?, ?)
-        '''
-        
         segment_id = execute_query(
-            query,
+            _Q_INSERT,
             (project_id, segment_index, content, word_count, chapter_title),
             fetch=False
         )
@@ -63,18 +123,32 @@ class TextSegment:
         批量创建文本段落
         
         Args:
-            segments_data: 段落数据列表
+            segments_data: 段落数据列表，元素为 (项目ID, 段落序号, 内容, 字数, 章节标题)
             
         Returns:
             影响的行数
         """
-        query = '''
-            INSERT INTO text_segments 
-            (project_id, segment_index, content, word_count, chapter_title)
-            VALUES (?, ?, ?, ?, ?)
-        '''
+        # 整批在一个事务中写入，开始时即获取写锁，避免中途与其他写入方争锁
+        db = get_db()
+        if db.in_transaction:
+            db.commit()
+        rowcount = 0
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            # 每条 INSERT 写入多行，减少语句执行次数
+            for start in range(0, len(segments_data), _INSERT_CHUNK_SIZE):
+                chunk = segments_data[start:start + _INSERT_CHUNK_SIZE]
+                if len(chunk) == _INSERT_CHUNK_SIZE:
+                    query = _Q_INSERT_CHUNK
+                else:
+                    query = _INSERT_PREFIX + ', '.join([_INSERT_ROW] * len(chunk))
+                rowcount += db.execute(query, list(chain.from_iterable(chunk))).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
         
-        return execute_many(query, segments_data)
+        return rowcount
     
     @classmethod
     def get_by_id(cls, segment_id):
@@ -87,18 +161,39 @@ class TextSegment:
         Returns:
             TextSegment对象或None
         """
-        query = 'SELECT * FROM text_segments WHERE id = ?'
-        rows = execute_query(query, (segment_id,))
-        # 防御性处理返回类型：确保可迭代且至少一个元素
-        if not rows:
-            return None
-        try:
-            first = rows[0] if isinstance(rows, (list, tuple)) and rows else None
-        except Exception:
-            first = None
-        if first is None:
-            return None
-        return cls._from_row(first)
+        row = execute_query(_Q_GET_BY_ID, (segment_id,), fetch='one')
+        if row:
+            return cls._from_row(row)
+        return None
+    
+    @classmethod
+    def iter_by_project(cls, project_id):
+        """
+        逐行遍历项目的所有段落（不一次性加载全部结果）
+        
+        Args:
+            project_id: 项目ID
+            
+        Yields:
+            TextSegment对象
+        """
+        for row in execute_query(_Q_GET_BY_PROJECT, (project_id,), fetch='iter'):
+            yield cls._from_row(row)
+    
+    @classmethod
+    def concat_contents(cls, project_id, separator='\n\n'):
+        """
+        按段落索引顺序拼接项目的全部段落内容（在数据库中完成拼接，不创建TextSegment对象）
+        
+        Args:
+            project_id: 项目ID
+            separator: 段落之间的分隔符
+            
+        Returns:
+            拼接后的文本，项目没有段落时为空字符串
+        """
+        row = execute_query(_Q_CONCAT_CONTENT_BY_PROJECT, (separator, project_id), fetch='one')
+        return row[0] or ''
     
     @classmethod
     def get_by_project(cls, project_id):
@@ -111,14 +206,36 @@ class TextSegment:
         Returns:
             TextSegment对象列表
         """
-        query = '''
-            SELECT * FROM text_segments 
-            WHERE project_id = ? 
-            ORDER BY segment_index
-        '''
-        rows = execute_query(query, (project_id,))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
+        return list(cls.iter_by_project(project_id))
+    
+    @classmethod
+    def get_by_project_lite(cls, project_id):
+        """
+        获取项目的所有段落（精简版，content 仅包含前101个字符，用于统计和列表展示）
+        
+        Args:
+            project_id: 项目ID
+            
+        Returns:
+            TextSegment对象列表
+        """
+        rows = execute_query(_Q_GET_BY_PROJECT_LITE, (project_id,))
+        return [cls._from_row(row) for row in rows]
+    
+    @classmethod
+    def get_by_status(cls, project_id, status, limit=None):
+        """
+        获取项目内指定音频状态的段落
+        
+        Args:
+            project_id: 项目ID
+            status: 音频状态
+            limit: 限制数量，None表示不限制
+            
+        Returns:
+            TextSegment对象列表
+        """
+        rows = execute_query(_Q_GET_BY_STATUS, (project_id, status, limit or -1))
         return [cls._from_row(row) for row in rows]
     
     @classmethod
@@ -133,19 +250,7 @@ class TextSegment:
         Returns:
             TextSegment对象列表
         """
-        query = '''
-            SELECT * FROM text_segments 
-            WHERE project_id = ? AND audio_status = ? 
-            ORDER BY segment_index
-        '''
-        
-        if limit:
-            query += f' LIMIT {limit}'
-        
-        rows = execute_query(query, (project_id, cls.AUDIO_STATUS_PENDING))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
-        return [cls._from_row(row) for row in rows]
+        return cls.get_by_status(project_id, cls.AUDIO_STATUS_PENDING, limit)
     
     @classmethod
     def update_audio_status(cls, segment_id, status, audio_path=None, audio_duration=None):
@@ -158,39 +263,33 @@ class TextSegment:
             audio_path: 音频文件路径（支持绝对路径或相对路径，会自动转换为相对路径保存）
             audio_duration: 音频时长（秒）
         """
-        if audio_path and audio_duration is not None:
-            # 转换为相对路径后保存
-            relative_path = cls.convert_to_relative_path(audio_path)
-            query = '''
-                UPDATE text_segments 
-                SET audio_status = ?, audio_path = ?, audio_duration = ?
-                WHERE id = ?
-            '''
-            execute_query(query, (status, relative_path, audio_duration, segment_id), fetch=False)
-        elif audio_path:
-            # 转换为相对路径后保存
-            relative_path = cls.convert_to_relative_path(audio_path)
-            query = '''
-                UPDATE text_segments 
-                SET audio_status = ?, audio_path = ?
-                WHERE id = ?
-            '''
-            execute_query(query, (status, relative_path, segment_id), fetch=False)
-        elif audio_duration is not None:
-            # 只更新时长
-            query = '''
-                UPDATE text_segments 
-                SET audio_status = ?, audio_duration = ?
-                WHERE id = ?
-            '''
-            execute_query(query, (status, audio_duration, segment_id), fetch=False)
-        else:
-            query = '''
-                UPDATE text_segments 
-                SET audio_status = ?
-                WHERE id = ?
-            '''
-            execute_query(query, (status, segment_id), fetch=False)
+        # 转换为相对路径后保存，未提供路径/时长时保留原值
+        relative_path = cls.convert_to_relative_path(audio_path)
+        execute_query(
+            _Q_UPDATE_AUDIO_STATUS,
+            (status, relative_path, audio_duration, segment_id),
+            fetch=False
+        )
+    
+    @classmethod
+    def update_audio_status_batch(cls, updates):
+        """
+        批量更新音频状态（单个事务内执行）
+        
+        Args:
+            updates: (段落ID, 新状态, 音频路径或None, 音频时长或None) 元组列表，
+                     路径/时长为None时保留原值
+            
+        Returns:
+            影响的行数
+        """
+        if not updates:
+            return 0
+        
+        return execute_many(_Q_UPDATE_AUDIO_STATUS, [
+            (status, cls.convert_to_relative_path(audio_path), audio_duration, segment_id)
+            for segment_id, status, audio_path, audio_duration in updates
+        ])
     
     @classmethod
     def get_completed_segments(cls, project_id):
@@ -203,15 +302,23 @@ class TextSegment:
         Returns:
             TextSegment对象列表
         """
-        query = '''
-            SELECT * FROM text_segments 
-            WHERE project_id = ? AND audio_status = ? 
-            ORDER BY segment_index
-        '''
-        rows = execute_query(query, (project_id, cls.AUDIO_STATUS_COMPLETED))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
-        return [cls._from_row(row) for row in rows]
+        return cls.get_by_status(project_id, cls.AUDIO_STATUS_COMPLETED)
+    
+    @classmethod
+    def get_completed_audio_summary(cls, project_id):
+        """
+        汇总项目已完成音频的段落数和总时长（使用TTS时写入的 audio_duration，不读取音频文件）
+        
+        Args:
+            project_id: 项目ID
+            
+        Returns:
+            (段落数, 总时长(秒)) 元组
+        """
+        count, total_duration = execute_query(
+            _Q_GET_AUDIO_SUMMARY, (project_id, cls.AUDIO_STATUS_COMPLETED), fetch='one'
+        )
+        return count, total_duration
     
     @classmethod
     def get_failed_segments(cls, project_id):
@@ -224,15 +331,7 @@ class TextSegment:
         Returns:
             TextSegment对象列表
         """
-        query = '''
-            SELECT * FROM text_segments 
-            WHERE project_id = ? AND audio_status = ? 
-            ORDER BY segment_index
-        '''
-        rows = execute_query(query, (project_id, cls.AUDIO_STATUS_FAILED))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
-        return [cls._from_row(row) for row in rows]
+        return cls.get_by_status(project_id, cls.AUDIO_STATUS_FAILED)
 
     @classmethod
     def reset_audio_status_by_project(cls, project_id, from_status, to_status):
@@ -268,35 +367,12 @@ class TextSegment:
         从数据库行创建对象
         
         Args:
-            row: 数据库行
+            row: 按 _COLUMNS 顺序查询的数据库行
             
         Returns:
             TextSegment对象
         """
-        # 使用安全的字典访问，避免类型检查器对未知/不支持 __getitem__ 的对象报错
-        try:
-            get = row.get  # 优先使用映射类型的 get
-        except AttributeError:
-            # 兜底处理，尝试按字典构造
-            try:
-                row = dict(row)
-                get = row.get
-            except Exception:
-                # 无法转为字典时直接抛出更易读的异常
-                raise TypeError(f"无法从行对象构建 TextSegment，期望映射类型，得到: {type(row)}")
-
-        return cls(
-            id=get('id'),
-            project_id=get('project_id'),
-            segment_index=get('segment_index'),
-            content=get('content'),
-            word_count=get('word_count'),
-            chapter_title=get('chapter_title'),
-            audio_status=get('audio_status', cls.AUDIO_STATUS_PENDING),
-            audio_path=get('audio_path'),
-            audio_duration=get('audio_duration'),
-            created_at=get('created_at')
-        )
+        return cls(*row)
     
     @staticmethod
     def convert_to_relative_path(absolute_path):
@@ -342,7 +418,21 @@ class TextSegment:
         
         # ⚠️ 注意：此路径不包含项目ID，可能不正确
         # 应该使用 get_absolute_audio_path() 实例方法替代
-        return os.path.join(DefaultConfig.TEMP_AUDIO_DIR, relative_path)
+        return os.path.join(_TEMP_AUDIO_DIR, relative_path)
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def project_audio_dir(project_id):
+        """
+        获取项目的临时音频目录（按项目ID缓存）
+        
+        Args:
+            project_id: 项目ID
+            
+        Returns:
+            temp/audio/{project_id} 的绝对路径
+        """
+        return os.path.join(_TEMP_AUDIO_DIR, str(project_id))
     
     def get_absolute_audio_path(self):
         """
@@ -351,15 +441,16 @@ class TextSegment:
         Returns:
             绝对路径
         """
-        if not self.audio_path:
+        audio_path = self.audio_path
+        if not audio_path:
             return None
         
         # 如果已经是绝对路径，直接返回
-        if os.path.isabs(self.audio_path):
-            return self.audio_path
+        if os.path.isabs(audio_path):
+            return audio_path
         
         # 拼接到 temp/audio/{project_id}/ 目录
-        return os.path.join(DefaultConfig.TEMP_AUDIO_DIR, str(self.project_id), self.audio_path)
+        return TextSegment.project_audio_dir(self.project_id) + os.sep + audio_path
     
     def to_dict(self):
         """
@@ -368,15 +459,18 @@ class TextSegment:
         Returns:
             段落信息字典
         """
-        # 处理 content 为 None 的情况，避免 len/切片错误
-        _content = self.content or ''
-        _content_preview = _content[:100] + '...' if len(_content) > 100 else _content
+        # 预览只生成一次；精简查询已在SQL中截断，内容不超过100字符时直接复用原字符串
+        content_preview = self._content_preview
+        if content_preview is None:
+            content = self.content or ''
+            content_preview = content if len(content) <= 100 else content[:100] + '...'
+            self._content_preview = content_preview
 
         return {
             'id': self.id,
             'project_id': self.project_id,
             'segment_index': self.segment_index,
-            'content': _content_preview,
+            'content': content_preview,
             'word_count': self.word_count,
             'chapter_title': self.chapter_title,
             'audio_status': self.audio_status,
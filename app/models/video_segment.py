@@ -1,6 +1,28 @@
 """视频片段模型"""
 from app.utils.database import execute_query
 
+# 查询列（顺序与构造函数参数一致）
+_COLUMNS = 'id, project_id, segment_index, duration, video_path, status, created_at'
+
+# 常用SQL语句（固定文本，保证命中连接的预编译语句缓存）
+_Q_INSERT = '''
+    INSERT INTO video_segments 
+    (project_id, segment_index, duration, video_path)
+    VALUES (?, ?, ?, ?)
+'''
+_Q_GET_BY_ID = f'SELECT {_COLUMNS} FROM video_segments WHERE id = ? LIMIT 1'
+_Q_GET_BY_PROJECT = f'''
+    SELECT {_COLUMNS} FROM video_segments 
+    WHERE project_id = ? 
+    ORDER BY segment_index
+'''
+_Q_GET_BY_PROJECT_AND_INDEX = f'''
+    SELECT {_COLUMNS} FROM video_segments 
+    WHERE project_id = ? AND segment_index = ?
+    LIMIT 1
+'''
+_Q_UPDATE_STATUS = 'UPDATE video_segments SET status = ? WHERE id = ?'
+
 
 class VideoSegment:
     """视频片段数据模型"""
@@ -11,6 +33,9 @@ class VideoSegment:
     STATUS_COMPLETED = 'completed'
     STATUS_FAILED = 'failed'
     
+    __slots__ = ('id', 'project_id', 'segment_index', 'duration', 'video_path', 'status',
+                 'created_at')
+    
     def __init__(self, id=None, project_id=None, segment_index=None, duration=None,
                  video_path=None, status=STATUS_PENDING, created_at=None):
         self.id = id
@@ -35,14 +60,8 @@ class VideoSegment:
         Returns:
             片段ID
         """
-        query = '''
-            INSERT INTO video_segments 
-            (project_id, segment_index, duration, video_path)
-            VALUES (?, ?, ?, ?)
-        '''
-        
         segment_id = execute_query(
-            query,
+            _Q_INSERT,
             (project_id, segment_index, duration, video_path),
             fetch=False
         )
@@ -60,19 +79,10 @@ class VideoSegment:
         Returns:
             VideoSegment对象或None
         """
-        query = 'SELECT * FROM video_segments WHERE id = ?'
-        rows = execute_query(query, (segment_id,))
-        
-        # 防御性处理返回类型：确保可迭代且至少一个元素
-        if not rows:
-            return None
-        try:
-            first = rows[0] if isinstance(rows, (list, tuple)) and rows else None
-        except Exception:
-            first = None
-        if first is None:
-            return None
-        return cls._from_row(first)
+        row = execute_query(_Q_GET_BY_ID, (segment_id,), fetch='one')
+        if row:
+            return cls._from_row(row)
+        return None
     
     @classmethod
     def get_by_project(cls, project_id):
@@ -85,14 +95,7 @@ class VideoSegment:
         Returns:
             VideoSegment对象列表
         """
-        query = '''
-            SELECT * FROM video_segments 
-            WHERE project_id = ? 
-            ORDER BY segment_index
-        '''
-        rows = execute_query(query, (project_id,))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
+        rows = execute_query(_Q_GET_BY_PROJECT, (project_id,))
         return [cls._from_row(row) for row in rows]
     
     @classmethod
@@ -104,8 +107,7 @@ class VideoSegment:
             segment_id: 片段ID
             status: 新状态
         """
-        query = 'UPDATE video_segments SET status = ? WHERE id = ?'
-        execute_query(query, (status, segment_id), fetch=False)
+        execute_query(_Q_UPDATE_STATUS, (status, segment_id), fetch=False)
     
     @classmethod
     def get_by_project_and_index(cls, project_id, segment_index):
@@ -119,16 +121,9 @@ class VideoSegment:
         Returns:
             VideoSegment对象或None
         """
-        query = '''
-            SELECT * FROM video_segments 
-            WHERE project_id = ? AND segment_index = ?
-        '''
-        rows = execute_query(query, (project_id, segment_index))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
-        
-        if len(rows) > 0:
-            return cls._from_row(rows[0])
+        row = execute_query(_Q_GET_BY_PROJECT_AND_INDEX, (project_id, segment_index), fetch='one')
+        if row:
+            return cls._from_row(row)
         return None
     
     @classmethod
@@ -137,20 +132,12 @@ class VideoSegment:
         从数据库行创建对象
         
         Args:
-            row: 数据库行
+            row: 按 _COLUMNS 顺序查询的数据库行
             
         Returns:
             VideoSegment对象
         """
-        return cls(
-            id=row['id'],
-            project_id=row['project_id'],
-            segment_index=row['segment_index'],
-            duration=row['duration'],
-            video_path=row['video_path'],
-            status=row['status'],
-            created_at=row['created_at']
-        )
+        return cls(*row)
     
     def to_dict(self):
         """
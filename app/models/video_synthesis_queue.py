@@ -1,6 +1,66 @@
 """视频合成队列模型"""
-import json
+import orjson
+from collections import Counter
 from app.utils.database import execute_query
+from app.models.temp_video_segment import TempVideoSegment
+
+# 查询列（顺序与构造函数参数一致）
+_COLUMNS = ('id, project_id, video_index, output_video_path, temp_segment_ids, '
+            'total_duration, status, created_at, updated_at')
+
+# 常用SQL语句（固定文本，保证命中连接的预编译语句缓存）
+_Q_INSERT = '''
+    INSERT INTO video_synthesis_queue 
+    (project_id, video_index, output_video_path, temp_segment_ids, total_duration, status)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_Q_GET_BY_ID = f'SELECT {_COLUMNS} FROM video_synthesis_queue WHERE id = ? LIMIT 1'
+_Q_GET_BY_PROJECT = f'''
+    SELECT {_COLUMNS} FROM video_synthesis_queue 
+    WHERE project_id = ? 
+    ORDER BY video_index
+'''
+_Q_GET_BY_PROJECT_WITH_PROGRESS = f'''
+    SELECT {_COLUMNS},
+           CASE WHEN json_valid(q.temp_segment_ids) THEN
+               (SELECT COUNT(*) FROM json_each(q.temp_segment_ids) AS j
+                JOIN temp_video_segments AS t ON t.id = j.value
+                WHERE t.status IN (?, ?, ?))
+           ELSE 0 END,
+           CASE WHEN json_valid(q.temp_segment_ids) THEN json_array_length(q.temp_segment_ids) ELSE 0 END
+    FROM video_synthesis_queue AS q
+    WHERE q.project_id = ? 
+    ORDER BY q.video_index
+'''
+_Q_GET_BY_PROJECT_AND_INDEX = f'''
+    SELECT {_COLUMNS} FROM video_synthesis_queue 
+    WHERE project_id = ? AND video_index = ?
+    LIMIT 1
+'''
+_Q_GET_BY_STATUS = f'''
+    SELECT {_COLUMNS} FROM video_synthesis_queue 
+    WHERE project_id = ? AND status = ?
+    ORDER BY video_index
+'''
+_Q_GET_STATUS_SUMMARY = '''
+    SELECT status, COUNT(*), COALESCE(SUM(total_duration), 0)
+    FROM video_synthesis_queue 
+    WHERE project_id = ?
+    GROUP BY status
+'''
+_Q_GET_PENDING_QUEUE = f'''
+    SELECT {_COLUMNS} FROM video_synthesis_queue 
+    WHERE project_id = ? AND status = ?
+    ORDER BY video_index
+    LIMIT 1
+'''
+# 视为已合成的临时视频片段状态：合成完毕后片段状态可以是
+# STATUS_SYNTHESIZED（已合成）、STATUS_MERGED（已合并）、STATUS_DELETED（已删除）
+_SEGMENT_DONE_STATUSES = (TempVideoSegment.STATUS_SYNTHESIZED,
+                          TempVideoSegment.STATUS_MERGED,
+                          TempVideoSegment.STATUS_DELETED)
+
+_Q_UPDATE_STATUS = 'UPDATE video_synthesis_queue SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?'
 
 
 class VideoSynthesisQueue:
@@ -11,6 +71,9 @@ class VideoSynthesisQueue:
     STATUS_SYNTHESIZING = 'synthesizing'  # 正在合成
     STATUS_COMPLETED = 'completed'  # 已完成
     
+    __slots__ = ('id', 'project_id', 'video_index', 'output_video_path', '_temp_segment_ids_raw',
+                 '_temp_segment_ids', 'total_duration', 'status', 'created_at', 'updated_at')
+    
     def __init__(self, id=None, project_id=None, video_index=None, output_video_path=None,
                  temp_segment_ids=None, total_duration=None, status=STATUS_PENDING,
                  created_at=None, updated_at=None):
@@ -18,21 +81,32 @@ class VideoSynthesisQueue:
         self.project_id = project_id
         self.video_index = video_index
         self.output_video_path = output_video_path
-        # temp_segment_ids 可以是列表或JSON字符串
+        # temp_segment_ids 可以是列表或JSON字符串，字符串在首次访问时才解析
         if isinstance(temp_segment_ids, list):
-            self.temp_segment_ids = temp_segment_ids
-        elif isinstance(temp_segment_ids, str):
-            try:
-                self.temp_segment_ids = json.loads(temp_segment_ids)
-            except:
-                self.temp_segment_ids = []
+            self._temp_segment_ids_raw = None
+            self._temp_segment_ids = temp_segment_ids
         else:
-            self.temp_segment_ids = []
+            self._temp_segment_ids_raw = temp_segment_ids
+            self._temp_segment_ids = None
         self.total_duration = total_duration
         self.status = status
         self.created_at = created_at
         self.updated_at = updated_at
     
+    @property
+    def temp_segment_ids(self):
+        """
+        获取临时视频片段ID列表
+        
+        首次访问时解析原始JSON字符串并缓存在实例上，无效数据返回空列表
+        """
+        if self._temp_segment_ids is None:
+            try:
+                self._temp_segment_ids = orjson.loads(self._temp_segment_ids_raw) if self._temp_segment_ids_raw else []
+            except orjson.JSONDecodeError:
+                self._temp_segment_ids = []
+        return self._temp_segment_ids
+    
     @classmethod
     def create(cls, project_id, video_index, output_video_path, temp_segment_ids, total_duration):
         """
@@ -49,18 +123,12 @@ class VideoSynthesisQueue:
             队列记录ID
         """
         if isinstance(temp_segment_ids, list):
-            temp_segment_ids_json = json.dumps(temp_segment_ids)
+            temp_segment_ids_json = orjson.dumps(temp_segment_ids).decode('utf-8')
         else:
             temp_segment_ids_json = temp_segment_ids
         
-        query = '''
-            INSERT INTO video_synthesis_queue 
-            (project_id, video_index, output_video_path, temp_segment_ids, total_duration, status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        '''
-        
         queue_id = execute_query(
-            query,
+            _Q_INSERT,
             (project_id, video_index, output_video_path, temp_segment_ids_json, total_duration, cls.STATUS_PENDING),
             fetch=False
         )
@@ -78,18 +146,11 @@ class VideoSynthesisQueue:
         Returns:
             VideoSynthesisQueue对象或None
         """
-        query = 'SELECT * FROM video_synthesis_queue WHERE id = ?'
-        rows = execute_query(query, (queue_id,))
+        row = execute_query(_Q_GET_BY_ID, (queue_id,), fetch='one')
         
-        if not rows:
-            return None
-        try:
-            first = rows[0] if isinstance(rows, (list, tuple)) and rows else None
-        except Exception:
-            first = None
-        if first is None:
+        if row is None:
             return None
-        return cls._from_row(first)
+        return cls._from_row(row)
     
     @classmethod
     def get_by_project(cls, project_id):
@@ -102,16 +163,27 @@ class VideoSynthesisQueue:
         Returns:
             VideoSynthesisQueue对象列表
         """
-        query = '''
-            SELECT * FROM video_synthesis_queue 
-            WHERE project_id = ? 
-            ORDER BY video_index
-        '''
-        rows = execute_query(query, (project_id,))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
+        rows = execute_query(_Q_GET_BY_PROJECT, (project_id,))
         return [cls._from_row(row) for row in rows]
     
+    @classmethod
+    def iter_by_project_with_progress(cls, project_id):
+        """
+        逐行遍历项目的所有队列记录及各队列的片段合成进度（不一次性加载全部结果）
+        
+        由数据库展开 temp_segment_ids 并关联临时视频片段表统计，无需逐个查询片段；
+        查询在调用时立即执行，查询错误由调用方捕获，而不是在流式渲染途中才抛出
+        
+        Args:
+            project_id: 项目ID
+            
+        Returns:
+            (VideoSynthesisQueue对象, 已合成片段数, 总片段数) 元组的迭代器
+        """
+        params = (*_SEGMENT_DONE_STATUSES, project_id)
+        cursor = execute_query(_Q_GET_BY_PROJECT_WITH_PROGRESS, params, fetch='iter')
+        return ((cls(*row[:-2]), row[-2], row[-1]) for row in cursor)
+    
     @classmethod
     def get_by_project_and_index(cls, project_id, video_index):
         """
@@ -124,17 +196,10 @@ class VideoSynthesisQueue:
         Returns:
             VideoSynthesisQueue对象或None
         """
-        query = '''
-            SELECT * FROM video_synthesis_queue 
-            WHERE project_id = ? AND video_index = ?
-        '''
-        rows = execute_query(query, (project_id, video_index))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
-        
-        if len(rows) > 0:
-            return cls._from_row(rows[0])
-        return None
+        row = execute_query(_Q_GET_BY_PROJECT_AND_INDEX, (project_id, video_index), fetch='one')
+        if row is None:
+            return None
+        return cls._from_row(row)
     
     @classmethod
     def get_by_status(cls, project_id, status):
@@ -148,16 +213,26 @@ class VideoSynthesisQueue:
         Returns:
             VideoSynthesisQueue对象列表
         """
-        query = '''
-            SELECT * FROM video_synthesis_queue 
-            WHERE project_id = ? AND status = ?
-            ORDER BY video_index
-        '''
-        rows = execute_query(query, (project_id, status))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
+        rows = execute_query(_Q_GET_BY_STATUS, (project_id, status))
         return [cls._from_row(row) for row in rows]
     
+    @classmethod
+    def get_status_summary(cls, project_id):
+        """
+        按状态汇总项目的队列数量和总时长
+        
+        Args:
+            project_id: 项目ID
+            
+        Returns:
+            (Counter({状态: 队列数}), 总时长) 元组，不存在的状态计数为0
+        """
+        rows = execute_query(_Q_GET_STATUS_SUMMARY, (project_id,))
+        
+        status_counts = Counter({row[0]: row[1] for row in rows})
+        total_duration = sum(row[2] for row in rows)
+        return status_counts, total_duration
+    
     @classmethod
     def get_pending_queue(cls, project_id):
         """
@@ -169,19 +244,10 @@ class VideoSynthesisQueue:
         Returns:
             VideoSynthesisQueue对象或None
         """
-        query = '''
-            SELECT * FROM video_synthesis_queue 
-            WHERE project_id = ? AND status = ?
-            ORDER BY video_index
-            LIMIT 1
-        '''
-        rows = execute_query(query, (project_id, cls.STATUS_PENDING))
-        if not isinstance(rows, (list, tuple)):
-            rows = []
-        
-        if len(rows) > 0:
-            return cls._from_row(rows[0])
-        return None
+        row = execute_query(_Q_GET_PENDING_QUEUE, (project_id, cls.STATUS_PENDING), fetch='one')
+        if row is None:
+            return None
+        return cls._from_row(row)
     
     @classmethod
     def update_status(cls, queue_id, status):
@@ -192,8 +258,7 @@ class VideoSynthesisQueue:
             queue_id: 队列ID
             status: 新状态
         """
-        query = 'UPDATE video_synthesis_queue SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?'
-        execute_query(query, (status, queue_id), fetch=False)
+        execute_query(_Q_UPDATE_STATUS, (status, queue_id), fetch=False)
     
     @classmethod
     def _from_row(cls, row):
@@ -201,22 +266,12 @@ class VideoSynthesisQueue:
         从数据库行创建对象
         
         Args:
-            row: 数据库行
+            row: 按 _COLUMNS 顺序查询的数据库行
             
         Returns:
             VideoSynthesisQueue对象
         """
-        return cls(
-            id=row['id'],
-            project_id=row['project_id'],
-            video_index=row['video_index'],
-            output_video_path=row['output_video_path'],
-            temp_segment_ids=row['temp_segment_ids'],
-            total_duration=row['total_duration'],
-            status=row['status'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
-        )
+        return cls(*row)
     
     def to_dict(self):
         """
@@ -266,4 +321,7 @@ class VideoSynthesisQueue:
         Returns:
             JSON字符串
         """
-        return json.dumps(self.temp_segment_ids)
+        # 尚未解析时直接返回原始字符串，避免解析后再序列化
+        if self._temp_segment_ids is None and self._temp_segment_ids_raw:
+            return self._temp_segment_ids_raw
+        return orjson.dumps(self.temp_segment_ids).decode('utf-8')
@@ -1,29 +1,88 @@
 """项目相关路由"""
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, stream_template, request, jsonify, redirect, url_for, flash
 from app.services.project_service import ProjectService
 from app.services.task_scheduler import TaskScheduler
 from app.models.project import Project
+from app.models.task import Task
 from app.models.text_segment import TextSegment
 from app.utils.logger import get_logger
 from app.utils.file_handler import FileHandler
 from config import DefaultConfig
 import os
+from functools import lru_cache
 
 logger = get_logger(__name__)
 
 project_bp = Blueprint('project', __name__, url_prefix='/project')
 
+# 创建项目时的配置参数表: (参数名, 类型转换函数, 默认值)
+_CREATE_CONFIG_SCHEMA = (
+    ('voice', str, 'zh-CN-XiaoxiaoNeural'),
+    ('rate', str, '+0%'),
+    ('pitch', str, '+0Hz'),
+    ('volume', str, '+0%'),
+    ('fps', int, 30),
+    ('bitrate', str, '2000k'),
+    ('format', str, 'mp4'),
+    ('segment_duration', int, 600),
+    ('segment_mode', str, 'word_count'),
+    ('max_words', int, 10000),
+)
+
+
+@lru_cache(maxsize=32)
+def _parse_resolution_str(value):
+    """
+    解析 "宽,高" 格式的分辨率字符串（常用取值很少，结果缓存）
+    
+    Args:
+        value: 分辨率字符串，如 "1920,1080"
+        
+    Returns:
+        (宽, 高) 元组
+        
+    Raises:
+        ValueError: 格式不正确
+    """
+    width, height = value.split(',', 1)
+    return int(width), int(height)
+
+
+def _parse_resolution(value):
+    """
+    解析分辨率参数（兼容 "宽,高" 字符串和两元素列表/元组）
+    
+    Args:
+        value: 分辨率参数
+        
+    Returns:
+        (宽, 高) 元组
+        
+    Raises:
+        ValueError: 格式不正确
+    """
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        return int(value[0]), int(value[1])
+    return _parse_resolution_str(str(value))
+
 
 @project_bp.route('/')
 def index():
     """项目列表页面"""
     try:
-        projects = ProjectService.get_all_projects()
-        return render_template('project_list.html', projects=projects)
+        # 总数由数据库聚合，项目列表边查询边渲染，避免一次性加载全部项目；
+        # 列表查询在开始流式响应前执行，查询失败时仍走下方的错误处理
+        total_projects = sum(Project.get_status_counts().values())
+        projects = Project.iter_all_lite()
+        return stream_template(
+            'project_list.html',
+            projects=projects,
+            total_projects=total_projects
+        )
     except Exception as e:
         logger.error(f'获取项目列表失败: {str(e)}', exc_info=True)
         flash(f'获取项目列表失败: {str(e)}', 'error')
-        return render_template('project_list.html', projects=[])
+        return render_template('project_list.html', projects=[], total_projects=0)
 
 
 @project_bp.route('/create', methods=['GET', 'POST'])
@@ -35,73 +94,31 @@ def create():
     try:
         # 支持 JSON 和表单两种提交方式
         # 优先解析 JSON，若非 JSON 则回退到表单
-        if request.is_json:
-            data = request.get_json(silent=True) or {}
-            name = str(data.get('name', '')).strip()
-            description = str(data.get('description', '')).strip()
-            text_content = str(data.get('text_content', '')).strip()
-            # 解析配置（兼容字符串/列表/数值）
-            resolution_val = data.get('resolution', '1920,1080')
-            if isinstance(resolution_val, (list, tuple)) and len(resolution_val) == 2:
-                resolution = (int(resolution_val[0]), int(resolution_val[1]))
-            else:
-                resolution = tuple(map(int, str(resolution_val).split(',')))
-            fps = int(data.get('fps', 30))
-            bitrate = str(data.get('bitrate', '2000k'))
-            fmt = str(data.get('format', 'mp4'))
-            segment_duration = int(data.get('segment_duration', 600))
-            segment_mode = str(data.get('segment_mode', 'word_count'))
-            max_words = int(data.get('max_words', 10000))
-            voice = str(data.get('voice', 'zh-CN-XiaoxiaoNeural'))
-            rate = str(data.get('rate', '+0%'))
-            pitch = str(data.get('pitch', '+0Hz'))
-            volume = str(data.get('volume', '+0%'))
-        else:
-            # 获取表单数据
-            name = request.form.get('name', '').strip()
-            description = request.form.get('description', '').strip()
-            text_content = request.form.get('text_content', '').strip()
-            resolution = tuple(map(int, request.form.get('resolution', '1920,1080').split(',')))
-            fps = int(request.form.get('fps', 30))
-            bitrate = request.form.get('bitrate', '2000k')
-            fmt = request.form.get('format', 'mp4')
-            segment_duration = int(request.form.get('segment_duration', 600))
-            segment_mode = request.form.get('segment_mode', 'word_count')
-            max_words = int(request.form.get('max_words', 10000))
-            voice = request.form.get('voice', 'zh-CN-XiaoxiaoNeural')
-            rate = request.form.get('rate', '+0%')
-            pitch = request.form.get('pitch', '+0Hz')
-            volume = request.form.get('volume', '+0%')
-        
-        # 处理背景图片上传
-        background_option = request.form.get('background_option', 'default')
+        is_json = request.is_json
+        data = (request.get_json(silent=True) or {}) if is_json else request.form
+        name = str(data.get('name', '')).strip()
+        description = str(data.get('description', '')).strip()
+        text_content = str(data.get('text_content', '')).strip()
+        
+        # 按参数表解析配置（兼容字符串/数值）
+        config = {key: cast(data.get(key, default)) for key, cast, default in _CREATE_CONFIG_SCHEMA}
+        config['resolution'] = _parse_resolution(data.get('resolution', '1920,1080'))
+        background_option = str(data.get('background_option', 'default'))
+        
+        # 处理背景图片上传（JSON 请求不包含上传文件，无需解析表单）
         custom_background_path = None
-        
-        if background_option == 'custom' and 'background_image' in request.files:
-            background_file = request.files['background_image']
-            if background_file and background_file.filename:
-                # 保存自定义背景图片
-                safe_filename = FileHandler.safe_filename(background_file.filename)
-                custom_background_path = os.path.join(DefaultConfig.TEMP_IMAGE_DIR, 'custom_backgrounds', safe_filename)
-                FileHandler.ensure_dir(os.path.dirname(custom_background_path))
-                background_file.save(custom_background_path)
-        
-        # 获取配置参数
-        config = {
-            'voice': voice,
-            'rate': rate,
-            'pitch': pitch,
-            'volume': volume,
-            'resolution': resolution,
-            'fps': fps,
-            'bitrate': bitrate,
-            'format': fmt,
-            'segment_duration': segment_duration,
-            'segment_mode': segment_mode,
-            'max_words': max_words,
-            'background_option': background_option,
-            'custom_background_path': custom_background_path
-        }
+        background_file = None
+        if not is_json and background_option == 'custom':
+            background_file = request.files.get('background_image')
+        if background_file and background_file.filename:
+            # 保存自定义背景图片
+            safe_filename = FileHandler.safe_filename(background_file.filename)
+            custom_background_path = os.path.join(DefaultConfig.TEMP_IMAGE_DIR, 'custom_backgrounds', safe_filename)
+            FileHandler.ensure_dir(os.path.dirname(custom_background_path))
+            background_file.save(custom_background_path)
+        
+        config['background_option'] = background_option
+        config['custom_background_path'] = custom_background_path
         
         # 验证必填字段
         if not name:
@@ -191,19 +208,28 @@ def retry_tts(project_id):
         if not project:
             return jsonify({'success': False, 'error': '项目不存在'}), 404
 
+        # 文本分段在后台执行，完成前段落不完整，不能开始语音合成
+        if Task.has_active_task(project_id, Task.TYPE_TEXT_IMPORT):
+            return jsonify({'success': False, 'error': '文本分段尚未完成，请稍后再试'}), 409
+
         # 重置所有非completed状态的段落为待处理
         # 这包括：FAILED、SYNTHESIZING、PENDING等
-        all_segments = TextSegment.get_by_project(project_id)
+        all_segments = TextSegment.get_by_project_lite(project_id)
+        reset_segments = [
+            segment for segment in all_segments
+            if segment.audio_status != TextSegment.AUDIO_STATUS_COMPLETED
+        ]
         reset_count = 0
         
-        for segment in all_segments:
-            if segment.audio_status != TextSegment.AUDIO_STATUS_COMPLETED:
-                try:
-                    TextSegment.update_audio_status(segment.id, TextSegment.AUDIO_STATUS_PENDING)
-                    reset_count += 1
-                    logger.info(f'重置段落为待处理: segment_id={segment.id}, 原状态={segment.audio_status}')
-                except Exception as e:
-                    logger.error(f'重置段落状态失败: segment_id={segment.id}, error={str(e)}')
+        try:
+            TextSegment.update_audio_status_batch([
+                (segment.id, TextSegment.AUDIO_STATUS_PENDING, None, None) for segment in reset_segments
+            ])
+            reset_count = len(reset_segments)
+            for segment in reset_segments:
+                logger.info(f'重置段落为待处理: segment_id={segment.id}, 原状态={segment.audio_status}')
+        except Exception as e:
+            logger.error(f'重置段落状态失败: project_id={project_id}, error={str(e)}')
         
         logger.info(f'重试语音合成: 项目ID={project_id}, 重置段落数={reset_count}')
         
@@ -249,6 +275,10 @@ def start_processing(project_id):
         if project.status != 'pending':
             return jsonify({'success': False, 'error': '项目状态不是待处理，无法开始处理'}), 400
 
+        # 文本分段在后台执行，完成前段落不完整，不能开始语音合成
+        if Task.has_active_task(project_id, Task.TYPE_TEXT_IMPORT):
+            return jsonify({'success': False, 'error': '文本分段尚未完成，请稍后再试'}), 409
+
         # 提交语音合成任务
         TaskScheduler.submit_tts_task(project_id)
         
@@ -315,39 +345,26 @@ def view_video_queue(project_id):
             flash('项目不存在', 'error')
             return redirect(url_for('project.index'))
         
-        # 获取项目的所有视频合成队列
+        # 由数据库按状态聚合统计信息
         from app.models.video_synthesis_queue import VideoSynthesisQueue
-        queues = VideoSynthesisQueue.get_by_project(project_id)
-        
-        # 计算统计信息
-        total_queues = len(queues)
-        completed_count = len([q for q in queues if q.status == VideoSynthesisQueue.STATUS_COMPLETED])
-        pending_count = len([q for q in queues if q.status == VideoSynthesisQueue.STATUS_PENDING])
-        synthesizing_count = len([q for q in queues if q.status == VideoSynthesisQueue.STATUS_SYNTHESIZING])
-        total_duration = sum(q.total_duration for q in queues)
-        
-        # 计算每个队列的已完成片段数和总片段数
-        from app.models.temp_video_segment import TempVideoSegment
-        queues_with_progress = []
-        for queue in queues:
-            # 计算该队列的已合成片段数
-            # 注意：根据流程，合成完毁后片段状态可以是
-            # STATUS_SYNTHESIZED（已合成）、STATUS_MERGED（已合并）、STATUS_DELETED（已删除）
-            completed_segments = 0
-            for temp_segment_id in queue.temp_segment_ids:
-                temp_seg = TempVideoSegment.get_by_id(temp_segment_id)
-                if temp_seg and temp_seg.status in [TempVideoSegment.STATUS_SYNTHESIZED, 
-                                                     TempVideoSegment.STATUS_MERGED, 
-                                                     TempVideoSegment.STATUS_DELETED]:
-                    completed_segments += 1
-            
-            queues_with_progress.append({
+        status_counts, total_duration = VideoSynthesisQueue.get_status_summary(project_id)
+        total_queues = sum(status_counts.values())
+        completed_count = status_counts[VideoSynthesisQueue.STATUS_COMPLETED]
+        pending_count = status_counts[VideoSynthesisQueue.STATUS_PENDING]
+        synthesizing_count = status_counts[VideoSynthesisQueue.STATUS_SYNTHESIZING]
+        
+        # 各队列的已合成片段数和总片段数，边查询边渲染（查询在开始流式响应前执行）
+        queues_with_progress = (
+            {
                 'queue': queue,
                 'completed_segments': completed_segments,
-                'total_segments': len(queue.temp_segment_ids)
-            })
+                'total_segments': total_segments
+            }
+            for queue, completed_segments, total_segments
+            in VideoSynthesisQueue.iter_by_project_with_progress(project_id)
+        )
         
-        return render_template(
+        return stream_template(
             'video_queue.html',
             project=project,
             queues=queues_with_progress,
@@ -375,24 +392,25 @@ def video_preview(project_id):
         config = project.config if isinstance(project.config, dict) else {}
         segment_duration = config.get('segment_duration', 600)
         
-        # 获取已完成的音频段落
+        # 由数据库汇总已完成音频的段落数和总时长
         from app.models.text_segment import TextSegment
-        completed_segments = TextSegment.get_completed_segments(project_id)
+        completed_count, total_audio_duration = TextSegment.get_completed_audio_summary(project_id)
         
-        # 获取已有的视频队列
+        # 汇总已有的视频队列
         from app.models.video_synthesis_queue import VideoSynthesisQueue
-        existing_queues = VideoSynthesisQueue.get_by_project(project_id)
+        queue_status_counts, queue_duration = VideoSynthesisQueue.get_status_summary(project_id)
+        existing_queue_count = sum(queue_status_counts.values())
         
-        if existing_queues:
+        if existing_queue_count:
             # 如果已有队列，返回实际数据
-            total_queue_count = len(existing_queues)
-            total_duration = sum(q.total_duration for q in existing_queues)
+            total_queue_count = existing_queue_count
+            total_duration = queue_duration
             estimated_time_minutes = int(total_duration / 60) if total_duration else 0
             estimated_disk_space_mb = int(total_queue_count * 100)  # 粗略估计每个视频100MB
             message = '已有生成队列数据，显示实际数据'
         else:
             # 若无队列，根据音频计算预估值
-            if not completed_segments:
+            if not completed_count:
                 return jsonify({
                     'success': True,
                     'data': {
@@ -406,7 +424,7 @@ def video_preview(project_id):
                 })
             
             # 计算预估队列数
-            total_audio_duration = sum(s.audio_duration for s in completed_segments if s.audio_duration)
+            total_duration = total_audio_duration
             total_queue_count = max(1, int(total_audio_duration / segment_duration))
             estimated_time_minutes = int(total_audio_duration / 60) if total_audio_duration else 0
             estimated_disk_space_mb = int(total_queue_count * 100)  # 粗略估计每个视频100MB
@@ -416,7 +434,7 @@ def video_preview(project_id):
             'success': True,
             'data': {
                 'total_queue_count': total_queue_count,
-                'total_duration': total_duration if existing_queues else (sum(s.audio_duration for s in completed_segments if s.audio_duration) or 0),
+                'total_duration': total_duration,
                 'segment_duration': segment_duration,
                 'estimated_time_minutes': estimated_time_minutes,
                 'estimated_disk_space_mb': estimated_disk_space_mb,
@@ -28,11 +28,9 @@ def get_task(task_id):
 def get_project_tasks(project_id):
     """获取项目的所有任务"""
     try:
-        tasks = Task.get_by_project(project_id)
-        
         return jsonify({
             'success': True,
-            'data': [task.to_dict() for task in tasks]
+            'data': Task.get_by_project_as_dicts(project_id)
         })
         
     except Exception as e:
@@ -44,11 +42,9 @@ def get_project_tasks(project_id):
 def get_running_tasks():
     """获取所有运行中的任务"""
     try:
-        tasks = Task.get_running_tasks()
-        
         return jsonify({
             'success': True,
-            'data': [task.to_dict() for task in tasks]
+            'data': Task.get_running_tasks_as_dicts()
         })
         
     except Exception as e:
@@ -7,14 +7,131 @@
 """
 
 import os
+import re
+import math
+import ctypes
 import platform
+import shutil
+import subprocess
+import threading
 import psutil
 import logging
-from typing import Dict, Any
+from bisect import bisect_left, bisect_right
+from functools import cached_property
+from typing import Dict, Any, List, Optional, Tuple
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# x264 预设按编码速度从快到慢排列
+_PRESET_SPEED_ORDER = ('ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium')
+
+# 内存档位: (内存上限GB(不含), 档位说明, 内存高效模式, 缓冲区大小MB, 允许的最慢预设)
+_MEMORY_TIERS = (
+    (4, '小内存模式(<4GB): 使用激进优化', True, 50, 'ultrafast'),
+    (8, '中等内存模式(4-8GB): 使用平衡优化', True, 100, 'superfast'),
+    (16, '较好内存模式(8-16GB): 使用轻度优化', False, 150, 'superfast'),
+    (math.inf, '充足内存模式(>16GB): 充分利用硬件', False, 200, 'faster'),
+)
+_MEMORY_TIER_BOUNDS = [tier[0] for tier in _MEMORY_TIERS[:-1]]
+
+# CPU档位: (物理核心数上限(含), 允许的最慢预设)
+_CORE_TIERS = (
+    (2, 'ultrafast'),
+    (4, 'ultrafast'),
+    (8, 'superfast'),
+    (math.inf, 'faster'),
+)
+_CORE_TIER_BOUNDS = [tier[0] for tier in _CORE_TIERS[:-1]]
+
+# (内存档位, CPU档位) -> 编码参数，模块加载时预先生成；
+# 预设取内存与CPU两者限制中更快的一个，保证小内存机器不会因核心数多而选用慢预设
+_PARAM_TABLE = {
+    (mem_index, core_index): {
+        'memory_efficient': memory_efficient,
+        'buffer_size_mb': buffer_size_mb,
+        'preset': min(mem_preset, core_preset, key=_PRESET_SPEED_ORDER.index),
+    }
+    for mem_index, (_, _, memory_efficient, buffer_size_mb, mem_preset) in enumerate(_MEMORY_TIERS)
+    for core_index, (_, core_preset) in enumerate(_CORE_TIERS)
+}
+
+# 由 ffmpeg/x264 自动分配线程数的预设（threads=0）
+_AUTO_THREAD_PRESETS = frozenset(('faster', 'fast', 'medium'))
+# 快速预设的最大编码线程数
+_MAX_FAST_PRESET_THREADS = 4
+# AMD AMF 编码器（不支持preset参数）
+_AMF_CODECS = frozenset(('h264_amf', 'hevc_amf'))
+# 常见分辨率下静态背景场景的码率（kbps），键为 (长边, 短边)
+_STATIC_BITRATE_KBPS = {
+    (854, 480): 500,
+    (1280, 720): 800,
+    (1920, 1080): 1500,
+    (2560, 1440): 3000,
+    (3840, 2160): 6000,
+}
+# 静态背景场景的关键帧间隔（秒）
+_STILL_IMAGE_GOP_SECONDS = 10
+
+# ffmpeg -encoders 输出中的编码器行，如 " V....D libx264  libx264 H.264 ..."
+_ENCODER_LINE_RE = re.compile(r'^\s*[VAS][A-Z.]{5}\s+([\w-]+)', re.MULTILINE)
+
+# ffmpeg 可执行文件的绝对路径（模块加载时查找一次，未安装时为None）
+_FFMPEG = shutil.which('ffmpeg')
+
+# ffmpeg 支持的编码器名称集合（进程内只探测一次）
+_ffmpeg_encoders = None
+_ffmpeg_encoders_lock = threading.Lock()
+
+
+def _get_ffmpeg_encoders() -> frozenset:
+    """获取ffmpeg支持的编码器名称集合
+    
+    首次调用时执行一次 ffmpeg -encoders 并缓存结果，之后直接返回缓存；
+    ffmpeg 不可用时返回空集合
+    """
+    global _ffmpeg_encoders
+    with _ffmpeg_encoders_lock:
+        if _ffmpeg_encoders is None and _FFMPEG is None:
+            logger.warning("未找到ffmpeg可执行文件，无法启用硬件加速编码")
+            _ffmpeg_encoders = frozenset()
+        if _ffmpeg_encoders is None:
+            try:
+                result = subprocess.run([_FFMPEG, '-hide_banner', '-encoders'],
+                                        capture_output=True, text=True, timeout=5)
+                _ffmpeg_encoders = frozenset(_ENCODER_LINE_RE.findall(result.stdout))
+            except Exception:
+                _ffmpeg_encoders = frozenset()
+        return _ffmpeg_encoders
+
+
+# 编码器实际可用性探测结果（编码器名称 -> 是否可用）
+_encoder_usable = {}
+_encoder_usable_lock = threading.Lock()
+
+
+def _can_initialize_encoder(codec: str) -> bool:
+    """检查编码器能否实际完成初始化
+    
+    ffmpeg -encoders 只说明编译时包含该编码器，显卡不带编码单元（如数据中心GPU）时
+    仍会在运行时失败，因此用极短的空白画面实际编码一次，每个编码器只探测一次
+    """
+    with _encoder_usable_lock:
+        usable = _encoder_usable.get(codec)
+        if usable is None:
+            usable = False
+            if codec in _get_ffmpeg_encoders():
+                try:
+                    result = subprocess.run(
+                        [_FFMPEG, '-hide_banner', '-f', 'lavfi', '-i', 'nullsrc=s=256x256:d=0.04',
+                         '-c:v', codec, '-f', 'null', '-'],
+                        capture_output=True, timeout=5)
+                    usable = result.returncode == 0
+                except Exception:
+                    pass
+            _encoder_usable[codec] = usable
+        return usable
+
 
 class HardwareInfo:
     """硬件信息类"""
@@ -30,32 +147,49 @@ class HardwareInfo:
         self.cpu_count_physical = psutil.cpu_count(logical=False) or (self.cpu_count // 2)  # 物理核心数
         
         # 内存信息
-        self.memory_total_gb = psutil.virtual_memory().total / (1024 ** 3)
-        self.memory_available_gb = psutil.virtual_memory().available / (1024 ** 3)
-        
-        # GPU信息
-        self.has_cuda = self._check_cuda()
-        self.has_opencl = self._check_opencl()
+        memory = psutil.virtual_memory()
+        self.memory_total_gb = memory.total / (1024 ** 3)
+        self.memory_available_gb = memory.available / (1024 ** 3)
         
         self._log_hardware_info()
     
+    @cached_property
+    def has_cuda(self) -> bool:
+        """是否支持CUDA（首次访问时检测）"""
+        has_cuda = self._check_cuda()
+        logger.info(f"GPU: CUDA={has_cuda}")
+        return has_cuda
+    
+    @cached_property
+    def has_opencl(self) -> bool:
+        """是否支持OpenCL（首次访问时检测）"""
+        has_opencl = self._check_opencl()
+        logger.info(f"GPU: OpenCL={has_opencl}")
+        return has_opencl
+    
     def _check_cuda(self) -> bool:
-        """检查是否支持CUDA (NVIDIA GPU)"""
+        """检查是否支持CUDA (NVIDIA GPU)
+        
+        在进程内加载CUDA驱动库，失败时再查找 nvidia-smi，无需导入torch
+        """
         try:
-            import torch
-            return torch.cuda.is_available()
-        except ImportError:
-            return False
+            if self.system == 'Linux':
+                ctypes.CDLL('libcuda.so.1')
+                return True
+            elif self.system == 'Windows':
+                ctypes.WinDLL('nvcuda.dll')
+                return True
         except Exception:
-            return False
+            pass
+        return shutil.which('nvidia-smi') is not None
     
     def _check_opencl(self) -> bool:
         """检查是否支持OpenCL"""
         try:
-            # 简单检查：在Linux上检查是否存在opencl库
+            # 简单检查：在Linux上尝试在进程内加载opencl库，找不到时抛出OSError（无需启动子进程）
             if self.system == 'Linux':
-                result = os.system('ldconfig -p | grep -q libOpenCL') == 0
-                return result
+                ctypes.CDLL('libOpenCL.so.1')
+                return True
             # Windows上通过环境变量检查
             elif self.system == 'Windows':
                 return 'OPENCL_VENDOR_PATH' in os.environ
@@ -68,7 +202,6 @@ class HardwareInfo:
         logger.info(f"系统信息: {self.system} {self.machine}")
         logger.info(f"CPU: {self.cpu_count} 逻辑核心, {self.cpu_count_physical} 物理核心")
         logger.info(f"内存: {self.memory_total_gb:.2f}GB 总量, {self.memory_available_gb:.2f}GB 可用")
-        logger.info(f"GPU: CUDA={self.has_cuda}, OpenCL={self.has_opencl}")
     
     def get_info_dict(self) -> Dict[str, Any]:
         """获取硬件信息字典"""
@@ -104,13 +237,15 @@ class VideoEncodingOptimizer:
             logger.error(f"硬件优化器初始化失败: {str(e)}", exc_info=True)
             # 使用默认硬件配置
             self.hardware = None
-        self._optimal_params = None
+        # 按参数组合缓存计算结果（实际使用的配置组合通常只有一两种）
+        self._optimal_params = {}
     
     def get_optimal_params(self, 
                           fps: int = 30,
                           bitrate: str = '2000k',
                           resolution: tuple = (1920, 1080),
-                          force_cpu: bool = False) -> Dict[str, Any]:
+                          force_cpu: bool = False,
+                          prefer_hevc: bool = False) -> Dict[str, Any]:
         """
         获取针对当前硬件的最优视频合成参数
         
@@ -119,36 +254,40 @@ class VideoEncodingOptimizer:
             bitrate: 比特率（默认'2000k'）
             resolution: 分辨率，(宽, 高)（默认(1920, 1080)）
             force_cpu: 强制使用CPU编码（用于调试或兼容性）
+            prefer_hevc: 使用NVIDIA硬件加速时优先选择HEVC编码器
             
         Returns:
             优化后的参数字典
         """
-        if self._optimal_params is None:
-            self._optimal_params = self._calculate_optimal_params(fps, bitrate, resolution, force_cpu)
+        key = (fps, bitrate, tuple(resolution), force_cpu, prefer_hevc)
+        params = self._optimal_params.get(key)
+        if params is None:
+            params = self._calculate_optimal_params(fps, bitrate, tuple(resolution), force_cpu, prefer_hevc)
+            self._optimal_params[key] = params
         
-        return self._optimal_params
+        return params
     
     def _calculate_optimal_params(self, fps: int, bitrate: str, 
-                                 resolution: tuple, force_cpu: bool) -> Dict[str, Any]:
-        """计算最优参数"""
-        
-        params = {
-            'fps': fps,
-            'bitrate': bitrate,
-            'resolution': resolution,
-            'codec': 'libx264',  # 默认编码器
-            'preset': 'ultrafast',  # 编码预设
-            'threads': 1,  # 编码线程数
-            'use_hardware_accel': False,  # 是否使用硬件加速
-            'buffer_size_mb': 100,  # 缓冲区大小（MB）
-            'pixel_format': 'yuv420p',  # 像素格式
-            'memory_efficient': False,  # 内存高效模式
-        }
+                                 resolution: tuple, force_cpu: bool,
+                                 prefer_hevc: bool = False) -> Dict[str, Any]:
+        """计算最优参数（各字段只确定一次，最后统一组装参数字典）"""
         
         # 如果硬件检测失败，使用默认参数
         if self.hardware is None:
             logger.warning("硬件检测失败，使用默认参数")
-            return params
+            return {
+                'fps': fps,
+                'bitrate': bitrate,
+                'resolution': resolution,
+                'codec': 'libx264',  # 默认编码器
+                'preset': 'ultrafast',  # 编码预设
+                'threads': 1,  # 编码线程数
+                'use_hardware_accel': False,  # 是否使用硬件加速
+                'buffer_size_mb': 100,  # 缓冲区大小（MB）
+                'pixel_format': 'yuv420p',  # 像素格式
+                'memory_efficient': False,  # 内存高效模式
+                'ffmpeg_params': self.get_still_image_params(fps),  # 静态画面编码参数
+            }
         
         # 根据硬件配置优化参数
         memory_gb = self.hardware.memory_total_gb
@@ -157,94 +296,50 @@ class VideoEncodingOptimizer:
         
         logger.info(f"开始优化视频合成参数: CPU={cpu_cores}核, 内存={memory_gb:.2f}GB")
         
-        # 1. 根据内存大小选择编码策略
-        if memory_gb < 4:
-            # 小内存设备（<4GB）：激进的内存优化
-            params['memory_efficient'] = True
-            params['buffer_size_mb'] = 50
-            params['preset'] = 'ultrafast'
-            params['threads'] = max(1, cpu_physical_cores // 2)
-            logger.info(f"小内存模式(<4GB): 使用激进优化, 线程数={params['threads']}")
-        
-        elif memory_gb < 8:
-            # 中等内存（4-8GB）：平衡的内存优化
-            params['memory_efficient'] = True
-            params['buffer_size_mb'] = 100
-            params['preset'] = 'superfast'
-            params['threads'] = max(1, cpu_physical_cores // 2)
-            logger.info(f"中等内存模式(4-8GB): 使用平衡优化, 线程数={params['threads']}")
-        
-        elif memory_gb < 16:
-            # 较好内存（8-16GB）：轻度内存优化
-            params['memory_efficient'] = False
-            params['buffer_size_mb'] = 150
-            params['preset'] = 'superfast'
-            params['threads'] = max(1, cpu_physical_cores - 1)
-            logger.info(f"较好内存模式(8-16GB): 使用轻度优化, 线程数={params['threads']}")
+        # 1. 按内存和CPU档位查表得到编码策略
+        mem_index = bisect_right(_MEMORY_TIER_BOUNDS, memory_gb)
+        core_index = bisect_left(_CORE_TIER_BOUNDS, cpu_physical_cores)
+        tier = _PARAM_TABLE[(mem_index, core_index)]
         
+        # 2. 根据预设和CPU核心数确定线程数
+        # x264 在 ultrafast/superfast 预设下线程扩展约在4线程处趋于饱和，手动指定过多线程反而降低效率，
+        # 因此快速预设最多使用4个线程；较慢预设设为0，交由 ffmpeg/x264 按逻辑核心数自动分配
+        cpu_preset = tier['preset']
+        if cpu_preset in _AUTO_THREAD_PRESETS:
+            cpu_threads = 0
         else:
-            # 充足内存（>16GB）：充分利用硬件
-            params['memory_efficient'] = False
-            params['buffer_size_mb'] = 200
-            params['preset'] = 'faster'
-            params['threads'] = cpu_physical_cores
-            logger.info(f"充足内存模式(>16GB): 充分利用硬件, 线程数={params['threads']}")
-        
-        # 2. 根据CPU核心数调整线程数
-        # 对于视频编码，通常4个线程效率最高，超过8个线程收益递减
-        if cpu_physical_cores <= 2:
-            params['threads'] = 1
-            params['preset'] = 'ultrafast'
-        elif cpu_physical_cores <= 4:
-            params['threads'] = 2
-            params['preset'] = 'ultrafast'
-        elif cpu_physical_cores <= 8:
-            params['threads'] = max(2, min(4, cpu_physical_cores - 1))
-            params['preset'] = 'superfast'
-        else:
-            params['threads'] = max(4, min(8, cpu_physical_cores - 2))
-            params['preset'] = 'faster'
+            cpu_threads = min(_MAX_FAST_PRESET_THREADS, cpu_physical_cores)
+        logger.info(f"{_MEMORY_TIERS[mem_index][1]}, 预设={cpu_preset}, 线程数={cpu_threads}")
         
         # 3. 根据分辨率和帧率调整比特率
         width, height = resolution
         pixel_count = width * height
-        target_bitrate = self._calculate_optimal_bitrate(pixel_count, fps, memory_gb)
+        target_bitrate = self._calculate_optimal_bitrate(pixel_count, fps, memory_gb, resolution)
         if target_bitrate:
-            params['bitrate'] = target_bitrate
-            logger.info(f"根据分辨率和内存调整比特率: {params['bitrate']}")
-        
-        # 4. 尝试启用硬件加速（如果可用且不强制CPU）
-        if not force_cpu:
-            if self.hardware.has_cuda and self._can_use_cuda_for_encoding():
-                params['use_hardware_accel'] = True
-                params['codec'] = 'hevc_nvenc'  # NVIDIA GPU编码器
-                params['preset'] = 'fast'  # NVIDIA的预设
-                params['threads'] = 0  # GPU编码不需要CPU线程
-                logger.info("启用NVIDIA CUDA硬件加速")
-            else:
-                # 检查是否支持其他GPU加速方案
-                amd_available = self._check_amd_encoding()
-                if amd_available:
-                    # 注意: h264_amf不支持preset参数，为avoid错误我们禁用硬件加速
-                    params['use_hardware_accel'] = False
-                    logger.info("检测到AMD GPU编码器，但不支持preset参数，降级为CPU编码")
-                else:
-                    # 检查macOS的硬件加速
-                    if self.hardware.system == 'Darwin':
-                        videotoolbox_available = self._check_videotoolbox_encoding()
-                        if videotoolbox_available:
-                            params['use_hardware_accel'] = True
-                            params['codec'] = 'h264_videotoolbox'  # macOS硬件加速
-                            params['preset'] = 'fast'
-                            params['threads'] = 0
-                            logger.info("启用macOS VideoToolbox硬件加速")
-                        else:
-                            params['use_hardware_accel'] = False
-                            logger.info("macOS: 未检测到硬件加速，使用CPU软件编码")
-                    else:
-                        # Linux或其他平台
-                        params['use_hardware_accel'] = False
-                        logger.info(f"{self.hardware.system}平台: 使用CPU软件编码")
+            bitrate = target_bitrate
+            logger.info(f"根据分辨率和内存调整比特率: {bitrate}")
+        
+        # 4. 尝试启用硬件加速（如果可用且不强制CPU），GPU编码器优先于CPU编码参数
+        hardware_encoder = None if force_cpu else self._select_hardware_encoder(prefer_hevc)
+        if hardware_encoder:
+            codec, preset = hardware_encoder
+            threads = 0  # GPU编码不需要CPU线程
+        else:
+            codec, preset, threads = 'libx264', cpu_preset, cpu_threads
+        
+        params = {
+            'fps': fps,
+            'bitrate': bitrate,
+            'resolution': resolution,
+            'codec': codec,
+            'preset': preset,
+            'threads': threads,
+            'use_hardware_accel': hardware_encoder is not None,
+            'buffer_size_mb': tier['buffer_size_mb'],
+            'pixel_format': 'yuv420p',
+            'memory_efficient': tier['memory_efficient'],
+            'ffmpeg_params': self.get_still_image_params(fps, codec),
+        }
         
         logger.info(f"最终参数配置: codec={params['codec']}, preset={params['preset']}, "
                    f"threads={params['threads']}, buffer={params['buffer_size_mb']}MB, "
@@ -252,11 +347,52 @@ class VideoEncodingOptimizer:
         
         return params
     
-    def _calculate_optimal_bitrate(self, pixel_count: int, fps: int, memory_gb: float) -> str:
+    def _select_hardware_encoder(self, prefer_hevc: bool = False) -> Optional[Tuple[str, Optional[str]]]:
+        """选择可用的GPU编码器
+        
+        Args:
+            prefer_hevc: 使用NVIDIA硬件加速时优先选择HEVC编码器
+            
+        Returns:
+            (编码器, 预设)，没有可用的GPU编码器时返回None
+        """
+        if self.hardware.has_cuda and self._can_use_cuda_for_encoding():
+            # H.264 NVENC 编码速度快于 HEVC 且 MP4 兼容性更好，默认优先使用
+            nvenc_codecs = ('hevc_nvenc', 'h264_nvenc') if prefer_hevc else ('h264_nvenc', 'hevc_nvenc')
+            logger.info("启用NVIDIA CUDA硬件加速")
+            return next(c for c in nvenc_codecs if _can_initialize_encoder(c)), 'fast'
+        
+        # 检查是否支持其他GPU加速方案
+        if self._check_amd_encoding():
+            # h264_amf不支持preset参数，改用AMF自身的 -quality/-usage 参数（见 get_still_image_params）
+            logger.info("启用AMD AMF硬件加速")
+            return 'h264_amf', None
+        
+        # 检查macOS的硬件加速
+        if self.hardware.system == 'Darwin':
+            if self._check_videotoolbox_encoding():
+                logger.info("启用macOS VideoToolbox硬件加速")
+                return 'h264_videotoolbox', 'fast'
+            logger.info("macOS: 未检测到硬件加速，使用CPU软件编码")
+        else:
+            # Linux或其他平台
+            logger.info(f"{self.hardware.system}平台: 使用CPU软件编码")
+        return None
+    
+    def _calculate_optimal_bitrate(self, pixel_count: int, fps: int, memory_gb: float,
+                                   resolution: tuple = None) -> str:
         """根据分辨率、帧率和内存计算最优比特率
         
-        对于静止背景的场景，可以使用较低的比特率
+        对于静止背景的场景，可以使用较低的比特率；常见分辨率直接查表，其他分辨率按公式估算
         """
+        # 竖屏分辨率与横屏使用相同码率
+        table_bitrate = (_STATIC_BITRATE_KBPS.get((max(resolution), min(resolution)))
+                         if resolution is not None else None)
+        if table_bitrate is not None:
+            if memory_gb < 4:
+                table_bitrate *= 0.8  # 小内存时进一步降低20%
+            return f"{int(table_bitrate)}k"
+        
         # 基础比特率计算：像素数 * 帧率 / 1000
         # 但由于是静止背景，可以减少20-40%
         base_bitrate = pixel_count * fps / 1000 * 0.6  # 减少40%用于静止背景
@@ -273,44 +409,64 @@ class VideoEncodingOptimizer:
     def _can_use_cuda_for_encoding(self) -> bool:
         """检查是否可以使用CUDA进行视频编码
         
-        需要检查ffmpeg是否编译了NVIDIA支持
+        需要检查ffmpeg是否编译了NVIDIA支持，且显卡的编码单元能实际初始化
         """
-        try:
-            import subprocess
-            result = subprocess.run(['ffmpeg', '-encoders'], 
-                                  capture_output=True, text=True, timeout=5)
-            return 'hevc_nvenc' in result.stdout or 'h264_nvenc' in result.stdout
-        except Exception:
-            return False
+        return _can_initialize_encoder('h264_nvenc') or _can_initialize_encoder('hevc_nvenc')
     
     def _check_amd_encoding(self) -> bool:
         """检查是否支持AMD GPU硬件加速编码
         
-        检查ffmpeg是否编译了h264_amf编码器支持
+        检查ffmpeg是否编译了h264_amf编码器支持，且显卡能实际初始化该编码器
         """
-        try:
-            import subprocess
-            result = subprocess.run(['ffmpeg', '-encoders'], 
-                                  capture_output=True, text=True, timeout=5)
-            return 'h264_amf' in result.stdout or 'hevc_amf' in result.stdout
-        except Exception:
-            return False
+        return _can_initialize_encoder('h264_amf')
     
     def _check_videotoolbox_encoding(self) -> bool:
         """检查是否支持macOS VideoToolbox硬件加速
         
         检查ffmpeg是否编译了videotoolbox编码器支持
         """
-        try:
-            import subprocess
-            result = subprocess.run(['ffmpeg', '-encoders'], 
-                                  capture_output=True, text=True, timeout=5)
-            return 'h264_videotoolbox' in result.stdout or 'hevc_videotoolbox' in result.stdout
-        except Exception:
-            return False
+        return not _get_ffmpeg_encoders().isdisjoint(('h264_videotoolbox', 'hevc_videotoolbox'))
     
-    def get_encoding_options(self) -> Dict[str, Any]:
-        """获取moviepy write_videofile方法的编码选项"""
+    def get_still_image_params(self, fps: int, codec: str = 'libx264') -> List[str]:
+        """获取静态背景场景的编码参数
+        
+        画面在整个片段内不变，拉长GOP并关闭场景切换检测后，除首个关键帧外几乎全部为
+        空P帧，编码开销接近常数
+        
+        Args:
+            fps: 帧率
+            codec: 视频编码器
+            
+        Returns:
+            追加到ffmpeg命令行的参数列表，编码器无对应参数时返回空列表
+        """
+        gop = str(fps * _STILL_IMAGE_GOP_SECONDS)
+        if codec == 'libx264':
+            # 不做场景切换检测和码率控制前瞻，单参考帧且不使用B帧
+            return [
+                '-tune', 'stillimage',
+                '-g', gop,
+                '-keyint_min', gop,
+                '-sc_threshold', '0',
+                '-x264-params', 'scenecut=0:rc-lookahead=0:ref=1:bframes=0',
+            ]
+        if codec in ('hevc_nvenc', 'h264_nvenc'):
+            # 恒定QP，画面不变时无需码率控制
+            return ['-rc', 'constqp', '-qp', '28', '-g', gop, '-no-scenecut', '1']
+        if codec in _AMF_CODECS:
+            # 画面不变时速度优先的质量档位几乎没有画质损失
+            return ['-usage', 'ultralowlatency', '-quality', 'speed', '-rc', 'cbr', '-g', gop]
+        return []
+    
+    def get_encoding_options(self, static_background: bool = False) -> Dict[str, Any]:
+        """获取moviepy write_videofile方法的编码选项
+        
+        Args:
+            static_background: 画面是否为静态背景图，为True时附加静态画面编码参数
+            
+        Returns:
+            编码选项字典
+        """
         params = self.get_optimal_params()
         
         options = {
@@ -318,15 +474,58 @@ class VideoEncodingOptimizer:
             'fps': params['fps'],
             'bitrate': params['bitrate'],
             'threads': params['threads'],
-            'preset': params['preset'],
         }
         
-        # 如果启用硬件加速，使用GPU编码器的特定参数
-        if params['use_hardware_accel']:
-            options['preset'] = 'fast'  # NVIDIA NVENC的预设
+        # AMF编码器不支持preset参数
+        if params['codec'] not in _AMF_CODECS:
+            options['preset'] = params['preset']
+        
+        if static_background and params['ffmpeg_params']:
+            options['ffmpeg_params'] = params['ffmpeg_params']
         
         return options
     
+    def build_ffmpeg_argv(self, bg_path: str, audio_path: str, out_path: str,
+                          params: Dict[str, Any] = None) -> List[str]:
+        """构造由背景图和音频直接合成视频的ffmpeg命令
+        
+        使用 -loop 1 让ffmpeg自行循环背景图，无需在Python中逐帧生成画面再通过管道传给ffmpeg
+        
+        Args:
+            bg_path: 背景图片路径
+            audio_path: 音频文件路径
+            out_path: 输出视频路径
+            params: 编码参数，默认使用 get_optimal_params() 的结果
+            
+        Returns:
+            可直接传给 subprocess.run 的参数列表
+        """
+        if params is None:
+            params = self.get_optimal_params()
+        
+        argv = [
+            _FFMPEG or 'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+            '-loop', '1', '-framerate', str(params['fps']), '-i', bg_path,
+            '-i', audio_path,
+            '-map', '0:v', '-map', '1:a',
+            '-c:v', params['codec'],
+        ]
+        if params['codec'] not in _AMF_CODECS:
+            argv += ['-preset', params['preset']]
+        argv += [
+            '-threads', str(params['threads']),
+            '-b:v', params['bitrate'],
+        ]
+        argv += params.get('ffmpeg_params', ())
+        argv += [
+            '-pix_fmt', params.get('pixel_format', 'yuv420p'),
+            '-c:a', 'aac',
+            '-shortest',
+            '-movflags', '+faststart',
+            out_path,
+        ]
+        return argv
+    
     def get_memory_efficient_config(self) -> Dict[str, Any]:
         """获取内存高效配置"""
         params = self.get_optimal_params()
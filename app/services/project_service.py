@@ -1,12 +1,13 @@
 """项目管理服务"""
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from app.models.project import Project
 from app.models.text_segment import TextSegment
 from app.models.task import Task
-from app.models.video_segment import VideoSegment
 from app.utils.logger import get_logger
 from app.utils.file_handler import FileHandler
+from app.utils.cache import project_cache
 from config import DefaultConfig
 
 logger = get_logger(__name__)
@@ -53,16 +54,16 @@ class ProjectService:
             relative_output_path = Project.convert_to_relative_path(output_path)
             
             # 创建项目（使用相对路径）
-            project_id = Project.create(name, description, relative_output_path, config)
+            project_id = Project.create(name, description, relative_output_path, config).id
             
             logger.info(f'项目创建成功: {name} (ID: {project_id})')
             
             # 创建文本导入任务
-            task_id = Task.create(project_id, Task.TYPE_TEXT_IMPORT)
+            task_id = Task.create(project_id, Task.TYPE_TEXT_IMPORT).id
             
-            # 开始处理文本
-            from app.services.text_processor import TextProcessor
-            TextProcessor.process_text(project_id, text_content, config, task_id)
+            # 文本分段交由任务调度器在后台执行，不阻塞请求
+            from app.services.task_scheduler import TaskScheduler
+            TaskScheduler.submit_text_import_task(project_id, text_content, config, task_id)
             
             return project_id, None
             
@@ -79,9 +80,18 @@ class ProjectService:
             project_id: 项目ID
             
         Returns:
-            项目对象或None
+            项目对象或None（可能来自缓存，调用方不应修改）
         """
-        return Project.get_by_id(project_id)
+        project = project_cache.get(project_id)
+        if project is not None:
+            return project
+        
+        # 先取版本号再回源，读取期间项目被更新时不把旧行写入缓存
+        version = project_cache.version()
+        project = Project.get_by_id(project_id)
+        if project is not None:
+            project_cache.set(project_id, project, version)
+        return project
     
     @staticmethod
     def get_all_projects():
@@ -109,36 +119,34 @@ class ProjectService:
             if not project:
                 return False, '项目不存在'
             
-            # 删除输出文件
+            # 删除输出文件和临时文件（各目录互不相关，并行删除）
+            directories = [
+                os.path.join(DefaultConfig.TEMP_AUDIO_DIR, str(project_id)),
+                os.path.join(DefaultConfig.TEMP_IMAGE_DIR, str(project_id)),
+                os.path.join(DefaultConfig.TEMP_VIDEO_DIR, str(project_id)),
+            ]
             output_path = project.get_absolute_output_path()
-            if output_path and os.path.exists(output_path):
-                FileHandler.delete_directory(output_path)
-            
-            # 删除临时文件
-            temp_audio_path = os.path.join(DefaultConfig.TEMP_AUDIO_DIR, str(project_id))
-            if os.path.exists(temp_audio_path):
-                FileHandler.delete_directory(temp_audio_path)
+            if output_path:
+                directories.append(output_path)
+            with ThreadPoolExecutor(max_workers=len(directories)) as executor:
+                list(executor.map(FileHandler.delete_directory, directories))
             
-            temp_image_path = os.path.join(DefaultConfig.TEMP_IMAGE_DIR, str(project_id))
-            if os.path.exists(temp_image_path):
-                FileHandler.delete_directory(temp_image_path)
-            
-            temp_video_path = os.path.join(DefaultConfig.TEMP_VIDEO_DIR, str(project_id))
-            if os.path.exists(temp_video_path):
-                FileHandler.delete_directory(temp_video_path)
+            # 删除尚未完成分段的原始文本
+            from app.services.task_scheduler import TaskScheduler
+            FileHandler.delete_file(TaskScheduler.import_text_path(project_id))
             
             # 删除项目相关的自定义背景图片
             if project.config and isinstance(project.config, dict):
                 custom_background_path = project.config.get('custom_background_path')
-                if custom_background_path:
-                    # 检查路径是否存在且在项目目录内，避免删除系统文件
-                    if os.path.exists(custom_background_path) and \
-                       DefaultConfig.TEMP_IMAGE_DIR in custom_background_path:
-                        try:
-                            os.remove(custom_background_path)
-                            logger.info(f'删除自定义背景图片: {custom_background_path}')
-                        except Exception as e:
-                            logger.warning(f'删除自定义背景图片失败: {custom_background_path}, 错误: {str(e)}')
+                # 只删除临时图片目录内的文件，避免删除系统文件；文件不存在时由异常判断，省去一次 stat
+                if custom_background_path and DefaultConfig.TEMP_IMAGE_DIR in custom_background_path:
+                    try:
+                        os.remove(custom_background_path)
+                        logger.info(f'删除自定义背景图片: {custom_background_path}')
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        logger.warning(f'删除自定义背景图片失败: {custom_background_path}, 错误: {str(e)}')
             
             # 删除数据库记录(会级联删除相关的段落、视频片段和任务)
             Project.delete(project_id)
@@ -163,39 +171,25 @@ class ProjectService:
             统计信息字典
         """
         try:
-            project = Project.get_by_id(project_id)
-            if not project:
+            # 统计接口会被前端轮询，项目存在性检查走项目缓存
+            if ProjectService.get_project(project_id) is None:
                 return None
             
-            segments = TextSegment.get_by_project(project_id)
-            tasks = Task.get_by_project(project_id)
-            video_segments = VideoSegment.get_by_project(project_id)
-            
-            total_segments = len(segments)
-            completed_segments = sum(1 for s in segments if s.audio_status == TextSegment.AUDIO_STATUS_COMPLETED)
-            pending_segments = sum(1 for s in segments if s.audio_status == TextSegment.AUDIO_STATUS_PENDING)
-            failed_segments = sum(1 for s in segments if s.audio_status == TextSegment.AUDIO_STATUS_FAILED)
-            total_words = sum((s.word_count or 0) for s in segments)
-            
-            # 视频统计信息
-            completed_video_segments = sum(1 for s in video_segments if s.status == VideoSegment.STATUS_COMPLETED)
-            pending_video_segments = sum(1 for s in video_segments if s.status == VideoSegment.STATUS_PENDING)
-            
-            # 总视频段落数 = 数据库中实际记录的视频段落数
-            # 这是根据实际生成的视频数量，而不是估算值
-            total_video_segments = len(video_segments)
+            # 段落与视频片段计数由触发器维护在 project_stats 汇总行中，只需读取一行
+            stats = Project.get_segment_stats(project_id)
+            tasks = Task.get_by_project_as_dicts(project_id)
             
             return {
-                'total_segments': total_segments,
-                'completed_segments': completed_segments,
-                'pending_segments': pending_segments,
-                'failed_segments': failed_segments,
-                'total_words': total_words,
-                'tasks': [t.to_dict() for t in tasks],
+                'total_segments': stats['total_segments'],
+                'completed_segments': stats['completed_segments'],
+                'pending_segments': stats['pending_segments'],
+                'failed_segments': stats['failed_segments'],
+                'total_words': stats['total_words'],
+                'tasks': tasks,
                 # 视频统计信息
-                'expected_video_segments': total_video_segments,  # 总视频段落数（根据音频时长计算得出）
-                'completed_video_segments': completed_video_segments,
-                'pending_video_segments': pending_video_segments
+                'expected_video_segments': stats['total_video_segments'],  # 总视频段落数（数据库中实际记录的视频段落数）
+                'completed_video_segments': stats['completed_video_segments'],
+                'pending_video_segments': stats['pending_video_segments']
             }
             
         except Exception as e:
@@ -244,32 +238,21 @@ class ProjectService:
                 return False, '项目不存在'
             
             # 更新项目配置
-            config = project.config if isinstance(project.config, dict) else {}
+            config = dict(project.config) if isinstance(project.config, dict) else {}
             config['segment_mode'] = segment_mode
             config['max_words'] = max_words
-            project.config = config
+            Project.update_config(project_id, config)
             
-            # 更新数据库中的配置
-            from app.utils.database import execute_query
-            query = 'UPDATE projects SET config_json = ? WHERE id = ?'
-            execute_query(query, (project.config_json, project_id), fetch=False)
-            
-            # 获取所有段落并重构原始文本
-            segments = TextSegment.get_by_project(project_id)
-            if not segments:
+            # 按段落索引顺序拼接内容重构原始文本
+            original_text = TextSegment.concat_contents(project_id)
+            if not original_text:
                 return False, '项目中没有文本段落'
             
-            # 按索引排序段落
-            segments.sort(key=lambda x: x.segment_index)
-            
-            # 重构原始文本
-            original_text = '\n\n'.join([segment.content for segment in segments])
-            
             # 删除现有的段落
             TextSegment.delete_by_project(project_id)
             
             # 创建文本导入任务
-            task_id = Task.create(project_id, Task.TYPE_TEXT_IMPORT)
+            task_id = Task.create(project_id, Task.TYPE_TEXT_IMPORT).id
             
             # 使用文本处理器重新分段
             from app.services.text_processor import TextProcessor
@@ -1,24 +1,56 @@
 """任务调度服务"""
+import asyncio
+import itertools
+import os
 import threading
-from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
+from config import DefaultConfig
 from app.models.task import Task
 from app.models.project import Project
+from app.utils.file_handler import FileHandler
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 任务优先级（数值越小越先执行）：文本导入最快且用户在等待分段结果，视频合成耗时最长
+_TASK_PRIORITIES = {'text_import': 0, 'tts': 1, 'video': 2}
+
+# 同一项目排队中只保留一个的任务类型（重复提交直接忽略）
+_COALESCED_TASK_TYPES = frozenset(('tts', 'video'))
+
+# 工作线程标记：任务执行期间置位，在任务内提交后续任务时不阻塞等待队列空位
+_worker_state = threading.local()
+
 
 class TaskScheduler:
     """任务调度服务类"""
     
-    # 任务队列
-    _task_queue = Queue()
+    # 任务队列（asyncio.PriorityQueue，在调度器事件循环内创建），元素为 (优先级, 序号, 任务信息)
+    _task_queue = None
+    _task_seq = itertools.count()
+    
+    # 排队中（尚未开始执行）的 (任务类型, 项目ID)，用于合并重复提交
+    _queued_keys = set()
+    _queued_lock = threading.Lock()
+    
+    # 调度器启动前提交的任务，启动后再放入队列
+    _pending_tasks = []
     
-    # 正在运行的任务
+    # 队列是否可直接接收任务、调度器是否已停止；与 _pending_tasks 一起由 _state_lock 保护
+    _accepting = False
+    _stopped = False
+    _state_lock = threading.Lock()
+    
+    # 正在运行的任务（项目ID -> 运行中的任务类型列表）
     _running_tasks = {}
+    _running_lock = threading.Lock()
     
-    # 调度器线程
+    # 调度器线程及其事件循环
     _scheduler_thread = None
+    _loop = None
+    
+    # 停止事件，置位后取消全部工作协程
+    _shutdown_event = None
     
     # 运行标志
     _running = False
@@ -47,22 +79,97 @@ class TaskScheduler:
         except Exception as e:
             logger.warning(f'重置处理中项目状态时出错(可能是数据库未初始化): {str(e)}')
         
+        config = TaskScheduler._app.config if TaskScheduler._app is not None else {}
+        worker_count = config.get('MAX_CONCURRENT_PROJECTS', DefaultConfig.MAX_CONCURRENT_PROJECTS)
+        queue_size = config.get('TASK_QUEUE_MAX_SIZE', DefaultConfig.TASK_QUEUE_MAX_SIZE)
+        
         TaskScheduler._running = True
+        with TaskScheduler._state_lock:
+            TaskScheduler._stopped = False
+        ready = threading.Event()
         TaskScheduler._scheduler_thread = threading.Thread(
-            target=TaskScheduler._schedule_loop,
+            target=TaskScheduler._run_event_loop,
+            args=(worker_count, queue_size, ready),
+            name='task-scheduler',
             daemon=True
         )
         TaskScheduler._scheduler_thread.start()
-        logger.info('任务调度器启动成功')
+        ready.wait()
+        
+        # 补交启动前提交的任务；切换为直接入队与取出暂存任务在同一把锁内完成，期间的提交不会丢失
+        with TaskScheduler._state_lock:
+            TaskScheduler._accepting = TaskScheduler._loop is not None
+            pending, TaskScheduler._pending_tasks = TaskScheduler._pending_tasks, []
+        for item in pending:
+            TaskScheduler._put(item)
+        logger.info(f'任务调度器启动成功: 工作协程数={worker_count}')
     
     @staticmethod
     def stop():
         """停止任务调度器"""
         TaskScheduler._running = False
+        with TaskScheduler._state_lock:
+            TaskScheduler._accepting = False
+            TaskScheduler._stopped = True
+        loop = TaskScheduler._loop
+        if loop is not None and TaskScheduler._shutdown_event is not None:
+            loop.call_soon_threadsafe(TaskScheduler._shutdown_event.set)
         if TaskScheduler._scheduler_thread:
             TaskScheduler._scheduler_thread.join(timeout=5)
+        # 队列中未执行的任务随事件循环一起丢弃
+        with TaskScheduler._queued_lock:
+            TaskScheduler._queued_keys.clear()
         logger.info('任务调度器已停止')
     
+    @staticmethod
+    def submit_text_import_task(project_id, text_content, config, task_id):
+        """
+        提交文本导入（分段）任务
+        
+        原始文本先写入临时文件再入队，进程重启后可从文件恢复未完成的导入
+        
+        Args:
+            project_id: 项目ID
+            text_content: 文本内容
+            config: 配置字典
+            task_id: 文本导入任务ID
+        """
+        FileHandler.ensure_dir(DefaultConfig.TEMP_IMPORT_DIR)
+        with open(TaskScheduler.import_text_path(project_id), 'w', encoding='utf-8') as f:
+            f.write(text_content)
+        TaskScheduler._enqueue_text_import(project_id, config, task_id)
+    
+    @staticmethod
+    def import_text_path(project_id):
+        """
+        获取项目待分段原始文本的临时文件路径
+        
+        Args:
+            project_id: 项目ID
+            
+        Returns:
+            文件路径
+        """
+        return os.path.join(DefaultConfig.TEMP_IMPORT_DIR, f'{project_id}.txt')
+    
+    @staticmethod
+    def _enqueue_text_import(project_id, config, task_id):
+        """
+        将已保存原始文本的文本导入任务放入调度队列
+        
+        Args:
+            project_id: 项目ID
+            config: 配置字典
+            task_id: 文本导入任务ID
+        """
+        if TaskScheduler._enqueue({
+            'type': 'text_import',
+            'project_id': project_id,
+            'config': config,
+            'task_id': task_id
+        }):
+            logger.info(f'文本导入任务已提交: 项目ID={project_id}')
+    
     @staticmethod
     def submit_tts_task(project_id):
         """
@@ -71,11 +178,11 @@ class TaskScheduler:
         Args:
             project_id: 项目ID
         """
-        TaskScheduler._task_queue.put({
+        if TaskScheduler._enqueue({
             'type': 'tts',
             'project_id': project_id
-        })
-        logger.info(f'语音合成任务已提交: 项目ID={project_id}')
+        }):
+            logger.info(f'语音合成任务已提交: 项目ID={project_id}')
     
     @staticmethod
     def submit_video_task(project_id):
@@ -85,32 +192,127 @@ class TaskScheduler:
         Args:
             project_id: 项目ID
         """
-        TaskScheduler._task_queue.put({
+        if TaskScheduler._enqueue({
             'type': 'video',
             'project_id': project_id
-        })
-        logger.info(f'视频生成任务已提交: 项目ID={project_id}')
+        }):
+            logger.info(f'视频生成任务已提交: 项目ID={project_id}')
+    
+    @staticmethod
+    def _enqueue(task_info):
+        """
+        按任务类型的优先级将任务放入调度队列（可在任意线程调用）
+        
+        同一项目已有相同类型的任务在排队时，语音合成和视频生成任务不会重复入队
+        
+        Args:
+            task_info: 任务信息字典
+            
+        Returns:
+            是否已入队（重复提交被合并或调度器已停止时为False）
+        """
+        task_type = task_info['type']
+        with TaskScheduler._queued_lock:
+            if task_type in _COALESCED_TASK_TYPES:
+                key = (task_type, task_info['project_id'])
+                if key in TaskScheduler._queued_keys:
+                    logger.info(f'任务已在队列中，忽略重复提交: 类型={task_type}, 项目ID={task_info["project_id"]}')
+                    return False
+                TaskScheduler._queued_keys.add(key)
+            item = (_TASK_PRIORITIES[task_type], next(TaskScheduler._task_seq), task_info)
+        if TaskScheduler._put(item):
+            return True
+        with TaskScheduler._queued_lock:
+            TaskScheduler._queued_keys.discard((task_type, task_info['project_id']))
+        return False
+    
+    @staticmethod
+    def _put(item):
+        """
+        将队列元素放入调度队列，调度器未启动时暂存
+        
+        队列已满时，请求线程阻塞等待空位以形成背压；工作线程（任务内提交的后续任务）不等待，
+        由事件循环在有空位时放入，避免所有工作线程都阻塞在只有工作线程才会消费的队列上
+        
+        Args:
+            item: (优先级, 序号, 任务信息) 元组
+            
+        Returns:
+            是否已接收（调度器已停止时为False）
+        """
+        with TaskScheduler._state_lock:
+            if not TaskScheduler._accepting:
+                if TaskScheduler._stopped:
+                    task_info = item[2]
+                    logger.warning(f'任务调度器已停止，拒绝提交任务: 类型={task_info["type"]}, '
+                                   f'项目ID={task_info["project_id"]}')
+                    return False
+                TaskScheduler._pending_tasks.append(item)
+                return True
+            future = asyncio.run_coroutine_threadsafe(TaskScheduler._task_queue.put(item), TaskScheduler._loop)
+        if not getattr(_worker_state, 'active', False):
+            future.result()
+        return True
     
     @staticmethod
-    def _schedule_loop():
-        """任务调度循环"""
-        import time
+    def _run_event_loop(worker_count, queue_size, ready):
+        """
+        调度器线程入口，运行事件循环直到停止
         
-        while TaskScheduler._running:
+        Args:
+            worker_count: 工作协程数量
+            queue_size: 任务队列容量
+            ready: 事件循环就绪后置位的事件
+        """
+        try:
+            asyncio.run(TaskScheduler._serve(worker_count, queue_size, ready))
+        except Exception as e:
+            logger.error(f'任务调度异常: {str(e)}', exc_info=True)
+        finally:
+            with TaskScheduler._state_lock:
+                TaskScheduler._accepting = False
+                TaskScheduler._loop = None
+            ready.set()
+    
+    @staticmethod
+    async def _serve(worker_count, queue_size, ready):
+        """
+        创建任务队列和工作协程，等待停止事件后取消全部工作协程
+        
+        Args:
+            worker_count: 工作协程数量
+            queue_size: 任务队列容量
+            ready: 事件循环就绪后置位的事件
+        """
+        TaskScheduler._loop = asyncio.get_running_loop()
+        # 阻塞的合成流程在专用线程池中执行，线程数与工作协程数一致
+        executor = ThreadPoolExecutor(max_workers=max(1, worker_count), thread_name_prefix='task-worker')
+        TaskScheduler._loop.set_default_executor(executor)
+        TaskScheduler._task_queue = asyncio.PriorityQueue(maxsize=queue_size)
+        TaskScheduler._shutdown_event = asyncio.Event()
+        
+        workers = [asyncio.create_task(TaskScheduler._worker()) for _ in range(max(1, worker_count))]
+        ready.set()
+        
+        await TaskScheduler._shutdown_event.wait()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    
+    @staticmethod
+    async def _worker():
+        """工作协程：从队列获取任务，在线程池中执行阻塞的合成流程"""
+        while True:
+            _, _, task_info = await TaskScheduler._task_queue.get()
+            # 开始执行后允许再次提交同类任务（执行期间的新提交对应新的进度）
+            with TaskScheduler._queued_lock:
+                TaskScheduler._queued_keys.discard((task_info['type'], task_info['project_id']))
             try:
-                # 从队列获取任务(非阻塞)
-                if not TaskScheduler._task_queue.empty():
-                    task_info = TaskScheduler._task_queue.get(timeout=1)
-                    
-                    # 执行任务
-                    TaskScheduler._execute_task(task_info)
-                else:
-                    # 没有任务时短暂休眠
-                    time.sleep(1)
-                    
+                await asyncio.to_thread(TaskScheduler._execute_task, task_info)
             except Exception as e:
                 logger.error(f'任务调度异常: {str(e)}', exc_info=True)
-                time.sleep(1)
+            finally:
+                TaskScheduler._task_queue.task_done()
     
     @staticmethod
     def _execute_task(task_info):
@@ -123,24 +325,72 @@ class TaskScheduler:
         task_type = task_info['type']
         project_id = task_info['project_id']
         
-        # 在新线程中执行任务
-        if task_type == 'tts':
-            thread = threading.Thread(
-                target=TaskScheduler._run_tts_task,
-                args=(project_id,),
-                daemon=True
-            )
-            thread.start()
-            TaskScheduler._running_tasks[project_id] = thread
+        # 同一项目可能有多个任务先后在不同工作线程中运行（如语音合成结束后立即提交的视频任务），
+        # 按项目记录运行中的任务类型列表，任务结束时只移除自身，避免误删其他任务的记录
+        with TaskScheduler._running_lock:
+            TaskScheduler._running_tasks.setdefault(project_id, []).append(task_type)
+        _worker_state.active = True
+        try:
+            if task_type == 'text_import':
+                TaskScheduler._run_text_import_task(project_id, task_info['config'], task_info['task_id'])
+            elif task_type == 'tts':
+                TaskScheduler._run_tts_task(project_id)
+            elif task_type == 'video':
+                TaskScheduler._run_video_task(project_id)
+        finally:
+            _worker_state.active = False
+            with TaskScheduler._running_lock:
+                task_types = TaskScheduler._running_tasks[project_id]
+                task_types.remove(task_type)
+                if not task_types:
+                    del TaskScheduler._running_tasks[project_id]
+    
+    @staticmethod
+    def _run_text_import_task(project_id, config, task_id):
+        """
+        运行文本导入（分段）任务，完成后删除原始文本临时文件
+        
+        Args:
+            project_id: 项目ID
+            config: 配置字典
+            task_id: 文本导入任务ID
+        """
+        # 在线程内推送应用上下文，避免数据库访问报错
+        if TaskScheduler._app is not None:
+            with TaskScheduler._app.app_context():
+                TaskScheduler._import_text(project_id, config, task_id)
+        else:
+            TaskScheduler._import_text(project_id, config, task_id)
+    
+    @staticmethod
+    def _import_text(project_id, config, task_id):
+        """
+        读取原始文本临时文件并分段，失败时将任务和项目标记为失败
+        
+        Args:
+            project_id: 项目ID
+            config: 配置字典
+            task_id: 文本导入任务ID
+        """
+        text_path = TaskScheduler.import_text_path(project_id)
+        try:
+            from app.services.text_processor import TextProcessor
+            
+            logger.info(f'开始执行文本导入任务: 项目ID={project_id}')
+            with open(text_path, encoding='utf-8') as f:
+                text_content = f.read()
+            success, error = TextProcessor.process_text(project_id, text_content, config, task_id)
+            FileHandler.delete_file(text_path)
             
-        elif task_type == 'video':
-            thread = threading.Thread(
-                target=TaskScheduler._run_video_task,
-                args=(project_id,),
-                daemon=True
-            )
-            thread.start()
-            TaskScheduler._running_tasks[project_id] = thread
+            if success:
+                logger.info(f'文本导入任务完成: 项目 ID={project_id}')
+            else:
+                logger.error(f'文本导入任务失败: 项目ID={project_id}, 错误: {error}')
+                TaskScheduler._fail_text_import(project_id, task_id, f'文本分段失败: {error}')
+                
+        except Exception as e:
+            logger.error(f'文本导入任务异常: 项目ID={project_id}, {str(e)}', exc_info=True)
+            TaskScheduler._fail_text_import(project_id, task_id, f'文本导入失败: {str(e)}')
     
     @staticmethod
     def _run_tts_task(project_id):
@@ -190,9 +440,6 @@ class TaskScheduler:
                 
         except Exception as e:
             logger.error(f'语音合成任务异常: 项目ID={project_id}, {str(e)}', exc_info=True)
-        finally:
-            if project_id in TaskScheduler._running_tasks:
-                del TaskScheduler._running_tasks[project_id]
     
     @staticmethod
     def _run_video_task(project_id):
@@ -235,9 +482,6 @@ class TaskScheduler:
                     Project.update_status(project_id, Project.STATUS_FAILED)
             else:
                 Project.update_status(project_id, Project.STATUS_FAILED)
-        finally:
-            if project_id in TaskScheduler._running_tasks:
-                del TaskScheduler._running_tasks[project_id]
     
     @staticmethod
     def get_running_tasks():
@@ -247,7 +491,65 @@ class TaskScheduler:
         Returns:
             运行中的任务项目ID列表
         """
-        return list(TaskScheduler._running_tasks.keys())
+        with TaskScheduler._running_lock:
+            return list(TaskScheduler._running_tasks.keys())
+    
+    @staticmethod
+    def _iter_interrupted_tasks():
+        """
+        遍历因系统重启而中断的任务（文本导入任务除外，由 _recover_text_import_tasks 处理）
+        
+        Yields:
+            Task对象
+        """
+        from app.models.task import Task
+        
+        for task in Task.iter_running_tasks():
+            if task.task_type != Task.TYPE_TEXT_IMPORT:
+                yield task
+    
+    @staticmethod
+    def _fail_text_import(project_id, task_id, error_message):
+        """
+        将文本导入任务及其项目标记为失败
+        
+        Args:
+            project_id: 项目ID
+            task_id: 文本导入任务ID
+            error_message: 错误信息
+        """
+        from app.models.project import Project
+        from app.models.task import Task
+        
+        Task.update_status(task_id, Task.STATUS_FAILED, error_message)
+        Project.update_status(project_id, Project.STATUS_FAILED)
+    
+    @staticmethod
+    def _recover_text_import_tasks():
+        """
+        恢复系统重启前未完成的文本导入任务
+        - 原始文本临时文件仍在时重新提交任务
+        - 文件已丢失时将任务和项目标记为失败，提示重新创建项目
+        """
+        from app.models.project import Project
+        from app.models.task import Task
+        
+        interrupted = [
+            task
+            for status in (Task.STATUS_PENDING, Task.STATUS_RUNNING)
+            for task in Task.iter_by_type_and_status(Task.TYPE_TEXT_IMPORT, status)
+        ]
+        for task in interrupted:
+            if os.path.exists(TaskScheduler.import_text_path(task.project_id)):
+                project = Project.get_by_id(task.project_id)
+                Task.update_status(task.id, Task.STATUS_PENDING)
+                TaskScheduler._enqueue_text_import(task.project_id, project.config, task.id)
+                logger.info(f'项目{task.project_id}的文本导入任务在重启前未完成，已重新提交')
+            else:
+                TaskScheduler._fail_text_import(
+                    task.project_id, task.id, '系统重启导致文本导入中断，原始文本已丢失，请重新创建项目'
+                )
+                logger.warning(f'项目{task.project_id}的文本导入任务在重启前未完成且原始文本已丢失，已标记为失败')
     
     @staticmethod
     def _reset_stale_processing_projects():
@@ -257,42 +559,42 @@ class TaskScheduler:
         - 如果音频已完全合成，设置为FAILED（等待用户重新生成视频）
         - 如果音频未完全合成，重置为PENDING（需要重新合成语音）
         - 将状态为running的任务重置为failed
+        - 从原始文本临时文件恢复未完成的文本导入任务
         """
         try:
             from app.models.project import Project
             from app.models.task import Task
-            from app.models.text_segment import TextSegment
             
             # 在线程内推送应用上下文，避免数据库访问报错
             if TaskScheduler._app is not None:
                 with TaskScheduler._app.app_context():
-                    # 重置处理中的项目状态
-                    projects = Project.get_all()
+                    # 重置处理中的项目状态（段落计数一次性读取，不逐项目查询段落）
+                    progress_rows = Project.get_audio_progress_by_status(Project.STATUS_PROCESSING)
+                    status_updates = []
                     reset_count = 0
                     failed_count = 0
                     
-                    for project in projects:
-                        if project.status == Project.STATUS_PROCESSING:
-                            # 检查项目的音频完成情况
-                            all_segments = TextSegment.get_by_project(project.id)
-                            completed_segments = TextSegment.get_completed_segments(project.id)
-                            
-                            if all_segments and completed_segments:
-                                audio_progress = (len(completed_segments) / len(all_segments)) * 100
-                            else:
-                                audio_progress = 0 if not all_segments else 100
-                            
-                            # 根据音频进度决定项目状态
-                            if audio_progress >= 100:
-                                # 音频已完全合成 → 设置为FAILED，等待用户点击生成视频
-                                Project.update_status(project.id, Project.STATUS_FAILED)
-                                logger.info(f'项目{project.id}音频已完成，重启后设置为失败状态，等待用户重新生成视频')
-                                failed_count += 1
-                            else:
-                                # 音频未完全合成 → 重置为PENDING，需要重新合成
-                                Project.update_status(project.id, Project.STATUS_PENDING)
-                                logger.info(f'项目{project.id}音频进度{audio_progress:.1f}%，重启后重置为待处理')
-                                reset_count += 1
+                    for project_id, total_segments, completed_segments in progress_rows:
+                        # 检查项目的音频完成情况
+                        if total_segments and completed_segments:
+                            audio_progress = (completed_segments / total_segments) * 100
+                        else:
+                            audio_progress = 0 if not total_segments else 100
+                        
+                        # 根据音频进度决定项目状态
+                        if audio_progress >= 100:
+                            # 音频已完全合成 → 设置为FAILED，等待用户点击生成视频
+                            status_updates.append((project_id, Project.STATUS_FAILED))
+                            logger.info(f'项目{project_id}音频已完成，重启后设置为失败状态，等待用户重新生成视频')
+                            failed_count += 1
+                        else:
+                            # 音频未完全合成 → 重置为PENDING，需要重新合成
+                            status_updates.append((project_id, Project.STATUS_PENDING))
+                            logger.info(f'项目{project_id}音频进度{audio_progress:.1f}%，重启后重置为待处理')
+                            reset_count += 1
+                    
+                    # 所有项目的状态变更在同一事务中写入
+                    Project.bulk_update_status(status_updates)
                     
                     if reset_count > 0:
                         logger.info(f'重置了 {reset_count} 个处理中的项目状态为待处理（需要重新合成语音）')
@@ -300,40 +602,42 @@ class TaskScheduler:
                         logger.info(f'设置了 {failed_count} 个处理中的项目为失败状态（等待生成视频）')
                     
                     # 重置运行中的任务状态
-                    tasks = Task.get_running_tasks()
-                    if tasks:
-                        for task in tasks:
-                            Task.update_status(task.id, Task.STATUS_FAILED, '系统重启导致任务中断')
-                        logger.info(f'重置了 {len(tasks)} 个运行中的任务状态为失败')
+                    updates = [
+                        (task.id, Task.STATUS_FAILED, '系统重启导致任务中断')
+                        for task in TaskScheduler._iter_interrupted_tasks()
+                    ]
+                    if updates:
+                        Task.bulk_update_status(updates)
+                        logger.info(f'重置了 {len(updates)} 个运行中的任务状态为失败')
+                    
+                    TaskScheduler._recover_text_import_tasks()
             else:
                 # 无应用上下文时的简化处理
-                projects = Project.get_all()
-                reset_count = 0
-                for project in projects:
-                    if project.status == Project.STATUS_PROCESSING:
-                        # 检查项目的音频完成情况
-                        all_segments = TextSegment.get_by_project(project.id)
-                        completed_segments = TextSegment.get_completed_segments(project.id)
-                        
-                        if all_segments and completed_segments:
-                            audio_progress = (len(completed_segments) / len(all_segments)) * 100
-                        else:
-                            audio_progress = 0 if not all_segments else 100
-                        
-                        # 根据音频进度决定项目状态
-                        if audio_progress >= 100:
-                            Project.update_status(project.id, Project.STATUS_FAILED)
-                            logger.info(f'项目{project.id}音频已完成，重启后设置为失败状态，等待用户重新生成视频')
-                        else:
-                            Project.update_status(project.id, Project.STATUS_PENDING)
-                            logger.info(f'项目{project.id}音频进度{audio_progress:.1f}%，重启后重置为待处理')
-                        reset_count += 1
+                progress_rows = Project.get_audio_progress_by_status(Project.STATUS_PROCESSING)
+                status_updates = []
+                for project_id, total_segments, completed_segments in progress_rows:
+                    # 检查项目的音频完成情况
+                    if total_segments and completed_segments:
+                        audio_progress = (completed_segments / total_segments) * 100
+                    else:
+                        audio_progress = 0 if not total_segments else 100
+                    
+                    # 根据音频进度决定项目状态
+                    if audio_progress >= 100:
+                        status_updates.append((project_id, Project.STATUS_FAILED))
+                        logger.info(f'项目{project_id}音频已完成，重启后设置为失败状态，等待用户重新生成视频')
+                    else:
+                        status_updates.append((project_id, Project.STATUS_PENDING))
+                        logger.info(f'项目{project_id}音频进度{audio_progress:.1f}%，重启后重置为待处理')
                 
+                reset_count = Project.bulk_update_status(status_updates)
                 if reset_count > 0:
                     logger.info(f'重置了 {reset_count} 个处理中的项目状态')
                 
-                tasks = Task.get_running_tasks()
-                for task in tasks:
-                    Task.update_status(task.id, Task.STATUS_FAILED, '系统重启导致任务中断')
+                Task.bulk_update_status([
+                    (task.id, Task.STATUS_FAILED, '系统重启导致任务中断')
+                    for task in TaskScheduler._iter_interrupted_tasks()
+                ])
+                TaskScheduler._recover_text_import_tasks()
         except Exception as e:
             logger.error(f'重置处理中项目状态失败: {str(e)}', exc_info=True)
\ No newline at end of file
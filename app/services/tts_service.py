@@ -1,5 +1,6 @@
 """语音合成服务"""
 import os
+import time
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from app.models.text_segment import TextSegment
@@ -18,6 +19,10 @@ class TTSService:
     # 线程池
     _executor = ThreadPoolExecutor(max_workers=DefaultConfig.MAX_THREAD_COUNT)
     
+    # 已完成段落状态的批量写入阈值：累计达到该数量或距上次写入超过该时间(秒)时写库
+    STATUS_FLUSH_SIZE = 20
+    STATUS_FLUSH_INTERVAL = 5.0
+    
     @staticmethod
     def synthesize_project(project_id):
         """
@@ -32,7 +37,7 @@ class TTSService:
         task_id = None
         try:
             # 创建任务
-            task_id = Task.create(project_id, Task.TYPE_AUDIO_SYNTHESIS)
+            task_id = Task.create(project_id, Task.TYPE_AUDIO_SYNTHESIS).id
             Task.update_status(task_id, Task.STATUS_RUNNING)
             
             # 更新项目状态
@@ -68,35 +73,55 @@ class TTSService:
             logger.info(f'开始语音合成: 项目ID={project_id}, 段落数={total_segments}')
             
             # 确保临时目录存在
-            temp_audio_dir = os.path.join(DefaultConfig.TEMP_AUDIO_DIR, str(project_id))
+            temp_audio_dir = TextSegment.project_audio_dir(project_id)
             FileHandler.ensure_dir(temp_audio_dir)
             
             # 多线程处理
             completed_count = 0
             failed_count = 0
             
-            for segment in segments:
-                try:
-                    TTSService._synthesize_segment(segment, config, temp_audio_dir)
-                    completed_count += 1
-                except Exception as e:
-                    logger.error(f'段落语音合成失败: segment_id={segment.id}, error={str(e)}')
-                    failed_count += 1
-                    # 确保段落状态被更新为失败
+            # 已完成但尚未写库的段落状态，批量写入
+            completed_updates = []
+            last_flush = time.monotonic()
+            
+            try:
+                for segment in segments:
                     try:
-                        TextSegment.update_audio_status(segment.id, TextSegment.AUDIO_STATUS_FAILED)
-                    except Exception as status_error:
-                        logger.error(f'更新段落状态失败: segment_id={segment.id}, error={str(status_error)}')
-                finally:
-                    # 确保无论如何都更新进度
-                    # 更新进度
-                    progress = (completed_count + failed_count) / total_segments * 100
-                    Task.update_progress(task_id, progress)
+                        audio_path, duration = TTSService._synthesize_segment(segment, config, temp_audio_dir)
+                        completed_updates.append(
+                            (segment.id, TextSegment.AUDIO_STATUS_COMPLETED, audio_path, duration)
+                        )
+                        completed_count += 1
+                        if (len(completed_updates) >= TTSService.STATUS_FLUSH_SIZE
+                                or time.monotonic() - last_flush >= TTSService.STATUS_FLUSH_INTERVAL):
+                            TextSegment.update_audio_status_batch(completed_updates)
+                            completed_updates = []
+                            last_flush = time.monotonic()
+                    except Exception as e:
+                        logger.error(f'段落语音合成失败: segment_id={segment.id}, error={str(e)}')
+                        failed_count += 1
+                        # 确保段落状态被更新为失败
+                        try:
+                            TextSegment.update_audio_status(segment.id, TextSegment.AUDIO_STATUS_FAILED)
+                        except Exception as status_error:
+                            logger.error(f'更新段落状态失败: segment_id={segment.id}, error={str(status_error)}')
+                    finally:
+                        # 确保无论如何都更新进度
+                        # 更新进度
+                        progress = (completed_count + failed_count) / total_segments * 100
+                        Task.update_progress(task_id, progress)
+            finally:
+                # 写入剩余的已完成段落状态（循环中途异常时也要写入，避免已生成音频的段落停留在合成中）；
+                # 写入失败只记录日志，不覆盖循环中抛出的原始异常
+                try:
+                    TextSegment.update_audio_status_batch(completed_updates)
+                except Exception as flush_error:
+                    logger.error(f'批量更新段落状态失败: 项目ID={project_id}, error={str(flush_error)}')
             
             # 完成所有处理后，进行最后一次数据库检查
             # 检查是否有遗留的 'synthesizing' 状态或其他非 'completed' 的段落
             logger.info(f'完成初始处理，进行最后一次数据库状态检查: 项目ID={project_id}')
-            all_project_segments = TextSegment.get_by_project(project_id)
+            all_project_segments = TextSegment.get_by_project_lite(project_id)
             retry_segments = []
             for seg in all_project_segments:
                 if seg.audio_status != TextSegment.AUDIO_STATUS_COMPLETED:
@@ -106,12 +131,13 @@ class TTSService:
             # 如果有未完成的段落，将其重新标记为 pending 供重试
             if retry_segments:
                 logger.info(f'发现 {len(retry_segments)} 个未完成的段落，重新标记为 pending 供重试')
-                for seg in retry_segments:
-                    try:
-                        TextSegment.update_audio_status(seg.id, TextSegment.AUDIO_STATUS_PENDING)
-                        logger.info(f'已重置段落 {seg.id} 为 pending 状态，供下次重试')
-                    except Exception as e:
-                        logger.error(f'重置段落状态失败: segment_id={seg.id}, error={str(e)}')
+                try:
+                    TextSegment.update_audio_status_batch([
+                        (seg.id, TextSegment.AUDIO_STATUS_PENDING, None, None) for seg in retry_segments
+                    ])
+                    logger.info(f'已重置段落 {[seg.id for seg in retry_segments]} 为 pending 状态，供下次重试')
+                except Exception as e:
+                    logger.error(f'重置段落状态失败: project_id={project_id}, error={str(e)}')
             
             # 完成任务
             if failed_count == 0 and not retry_segments:
@@ -145,6 +171,9 @@ class TTSService:
             segment: 文本段落对象
             config: 配置字典
             temp_audio_dir: 临时音频目录
+            
+        Returns:
+            (音频文件路径, 音频时长)，完成状态由调用方批量写入
         """
         # 更新状态为合成中
         TextSegment.update_audio_status(segment.id, TextSegment.AUDIO_STATUS_SYNTHESIZING)
@@ -214,15 +243,8 @@ class TTSService:
                         logger.warning(f'读取音频时长失败: {str(e)}')
                         duration = None
                     
-                    # 更新状态为已完成，并保存时长
-                    TextSegment.update_audio_status(
-                        segment.id,
-                        TextSegment.AUDIO_STATUS_COMPLETED,
-                        audio_path,
-                        audio_duration=duration
-                    )
                     logger.info(f'段落语音合成成功: segment_id={segment.id}')
-                    return
+                    return audio_path, duration
                 else:
                     raise Exception('音频文件生成失败')
                     
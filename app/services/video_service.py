@@ -140,12 +140,12 @@ class VideoService:
                             str(project_id),
                             f'segment_{segment.id}.mp4'
                         )
-                        temp_segment_id = TempVideoSegment.create(
+                        temp_segment = TempVideoSegment.create(
                             project_id=project_id,
                             text_segment_id=segment.id,
                             temp_video_path=relative_temp_video_path
                         )
-                        temp_segment_ids.append(temp_segment_id)
+                        temp_segment_ids.append(temp_segment.id)
                         selected_segment_ids.add(segment.id)
                     except Exception as e:
                         logger.error(f'创建TempVideoSegment失败: segment_id={segment.id}, {str(e)}')
@@ -196,7 +196,7 @@ class VideoService:
         project = None
         try:
             # 创建任务
-            task_id = Task.create(project_id, Task.TYPE_VIDEO_GENERATION)
+            task_id = Task.create(project_id, Task.TYPE_VIDEO_GENERATION).id
             Task.update_status(task_id, Task.STATUS_RUNNING)
             
             # 获取项目信息
@@ -209,7 +209,7 @@ class VideoService:
             config = project.config
             
             # 获取所有音频段落
-            all_segments = TextSegment.get_by_project(project_id)
+            all_segments = TextSegment.get_by_project_lite(project_id)
             completed_segments = TextSegment.get_completed_segments(project_id)
             
             # 检查音频合成进度是否达到100%
@@ -408,7 +408,7 @@ class VideoService:
             
             # 为了判断是否是一个特别的列表类型，轫换为dict
             segment_map = {}
-            all_segments = TextSegment.get_by_project(project_id)
+            all_segments = TextSegment.get_by_project_lite(project_id)
             for seg in all_segments:
                 segment_map[seg.id] = seg
             
@@ -942,12 +942,10 @@ class VideoService:
     @staticmethod
     def _create_and_save_video_segment(audio_path, image_path, output_path, config):
         """
-        创建单个视频片段并立即保存到文件（内存优化版本）
+        创建单个视频片段并立即保存到文件
         
-        优点：
-        - 创建后立即保存到文件，不在内存中留存clip对象
-        - 避免同时在内存中保留大量视频片段
-        - 使用PIL直接读取图片，比imageio更高效
+        背景图在整个片段内不变，直接调用ffmpeg以 -loop 1 循环背景图并与音频合成，
+        不经过moviepy在Python中逐帧生成画面，也不在内存中保留clip对象
         
         Args:
             audio_path: 音频文件路径
@@ -955,8 +953,7 @@ class VideoService:
             output_path: 输出视频文件路径
             config: 配置字典
         """
-        import numpy as np
-        from moviepy.editor import ImageClip, AudioFileClip
+        import subprocess
         
         fps = config.get('fps', DefaultConfig.DEFAULT_FPS)
         bitrate = config.get('bitrate', DefaultConfig.DEFAULT_BITRATE)
@@ -997,88 +994,35 @@ class VideoService:
                 'threads': 2
             }
         
-        # 初始化资源变量
-        audio_clip = None
-        image_clip = None
-        video_clip = None
-        pil_image = None
+        # 检查输入文件是否存在
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"音频文件不存在: {audio_path}")
+        
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"图片文件不存在: {image_path}")
+        
+        # 确保输出目录存在
+        FileHandler.ensure_dir(os.path.dirname(output_path))
+        
+        ffmpeg_cmd = get_optimizer().build_ffmpeg_argv(image_path, audio_path, output_path, optimal_params)
         
         try:
-            # 检查输入文件是否存在
-            if not os.path.exists(audio_path):
-                raise FileNotFoundError(f"音频文件不存在: {audio_path}")
-            
-            if not os.path.exists(image_path):
-                raise FileNotFoundError(f"图片文件不存在: {image_path}")
-            
-            # 加载音频
-            audio_clip = AudioFileClip(audio_path)
-            duration = audio_clip.duration
-            
-            # 使用PIL直接读取图片
-            pil_image = Image.open(image_path)
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            
-            # 转换为numpy数组
-            image_array = np.array(pil_image)
-            
-            # 创建ImageClip
-            image_clip = ImageClip(image_array, duration=duration)
-            image_clip = image_clip.set_fps(fps)
-            
-            # 设置音频
-            video_clip = image_clip.set_audio(audio_clip)
-            
-            # 确保输出目录存在
-            output_dir = os.path.dirname(output_path)
-            FileHandler.ensure_dir(output_dir)
-            
-            # 立即保存到文件，强制使用磁盘缓冲
-            output_dir = os.path.dirname(output_path)
-            output_basename = os.path.basename(output_path)
-            temp_audio_file = os.path.join(output_dir, f'{output_basename}_audio_temp.m4a')
-            
-            video_clip.write_videofile(
-                output_path,
-                fps=optimal_params['fps'],
-                codec=optimal_params['codec'],
-                bitrate=optimal_params['bitrate'],
-                audio_codec='aac',
-                temp_audiofile=temp_audio_file,
-                remove_temp=True,
-                logger=None,
-                threads=optimal_params['threads']
+            result = subprocess.run(
+                ffmpeg_cmd,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                timeout=3600  # 最长 1 小时
             )
-            
-        except MemoryError as e:
-            logger.error(f'创建视频片段时内存不足: audio_path={audio_path}, error={str(e)}')
-            raise
-        except Exception as e:
-            logger.error(f'创建视频片段失败: audio_path={audio_path}, error={str(e)}')
-            raise
-        finally:
-            # 确保释放所有资源
-            try:
-                if video_clip:
-                    video_clip.close()
-            except:
-                pass
-            try:
-                if audio_clip:
-                    audio_clip.close()
-            except:
-                pass
-            try:
-                if image_clip:
-                    image_clip.close()
-            except:
-                pass
-            try:
-                if pil_image:
-                    pil_image.close()
-            except:
-                pass
+        except subprocess.TimeoutExpired:
+            logger.error(f'创建视频片段超时: audio_path={audio_path}')
+            raise Exception('FFmpeg 合成视频片段超时')
+        
+        if result.returncode != 0:
+            error_msg = result.stderr if result.stderr else '未知错误'
+            logger.error(f'创建视频片段失败: audio_path={audio_path}, error={error_msg}')
+            raise Exception(f'FFmpeg 合成视频片段失败: {error_msg}')
     
     @staticmethod
     def _create_video_clip(audio_path, image_path, config):
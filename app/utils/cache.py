@@ -0,0 +1,185 @@
+"""进程内缓存工具模块"""
+import threading
+import time
+from collections import OrderedDict
+from config import DefaultConfig
+
+
+class TTLCache:
+    """带过期时间的单值缓存（线程安全）"""
+
+    def __init__(self, ttl):
+        """
+        Args:
+            ttl: 缓存有效期(秒)
+        """
+        self._ttl = ttl
+        self._value = None
+        self._expires = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        获取缓存值
+
+        Returns:
+            未过期的缓存值，过期或未设置时返回None
+        """
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires:
+                return self._value
+            return None
+
+    def set(self, value):
+        """
+        设置缓存值并刷新过期时间
+
+        Args:
+            value: 缓存值
+        """
+        with self._lock:
+            self._value = value
+            self._expires = time.monotonic() + self._ttl
+
+    def invalidate(self):
+        """使缓存失效"""
+        with self._lock:
+            self._value = None
+            self._expires = 0
+
+
+class LRUCache:
+    """
+    按最近使用淘汰的键值缓存（线程安全）
+
+    每次失效（pop/clear）都会递增版本号。回源读取前先取版本号，
+    写入时传回该版本号，读取期间发生过失效则放弃写入，避免把失效前读到的旧值写回缓存
+    """
+
+    def __init__(self, maxsize):
+        """
+        Args:
+            maxsize: 最大条目数，超出时淘汰最久未使用的条目
+        """
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def version(self):
+        """
+        获取当前版本号（回源读取前调用）
+
+        Returns:
+            版本号（整数）
+        """
+        with self._lock:
+            return self._version
+
+    def get(self, key):
+        """
+        获取缓存值
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存值，未命中时返回None
+        """
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, version=None):
+        """
+        设置缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            version: 回源读取前获取的版本号，期间发生过失效则不写入；为None时总是写入
+        """
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        """
+        使单个条目失效
+
+        Args:
+            key: 缓存键
+        """
+        with self._lock:
+            self._version += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._version += 1
+            self._data.clear()
+
+
+# 首页统计信息缓存
+dashboard_stats_cache = TTLCache(ttl=DefaultConfig.DASHBOARD_STATS_CACHE_TTL)
+
+# 项目对象缓存（按项目ID，供路由层读取）
+project_cache = LRUCache(maxsize=DefaultConfig.PROJECT_CACHE_SIZE)
+
+# 首页统计信息版本号，每次失效时递增，用于生成ETag
+_dashboard_stats_version = 0
+_dashboard_stats_version_lock = threading.Lock()
+
+
+def get_dashboard_stats_version():
+    """
+    获取首页统计信息的当前版本号
+    
+    Returns:
+        版本号（整数）
+    """
+    with _dashboard_stats_version_lock:
+        return _dashboard_stats_version
+
+
+def get_dashboard_stats():
+    """
+    获取缓存的首页统计信息
+
+    Returns:
+        统计信息字典的副本，缓存失效时返回None
+    """
+    stats = dashboard_stats_cache.get()
+    if stats is None:
+        return None
+    # 返回副本，避免调用方修改缓存内容
+    return dict(stats, recent_projects=list(stats['recent_projects']))
+
+
+def set_dashboard_stats(stats, version):
+    """
+    缓存首页统计信息
+
+    Args:
+        stats: 统计信息字典
+        version: 计算统计信息前读取的版本号，期间发生过失效则不缓存
+    """
+    with _dashboard_stats_version_lock:
+        if version != _dashboard_stats_version:
+            return
+        dashboard_stats_cache.set(dict(stats, recent_projects=list(stats['recent_projects'])))
+
+
+def invalidate_dashboard_stats():
+    """使首页统计信息缓存失效（项目创建、状态变更、删除时调用）"""
+    global _dashboard_stats_version
+    with _dashboard_stats_version_lock:
+        _dashboard_stats_version += 1
+        dashboard_stats_cache.invalidate()
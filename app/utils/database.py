@@ -1,36 +1,61 @@
 """数据库工具模块"""
 import sqlite3
-from flask import g
+import threading
+from queue import SimpleQueue, Empty
 from pathlib import Path
 
 
+# 线程本地连接，同一线程内的请求/任务复用连接和语句缓存
+_local = threading.local()
+
+
+def _connect():
+    """创建数据库连接并设置连接参数"""
+    from config import DefaultConfig
+    
+    # 确保数据库目录存在
+    db_path = Path(DefaultConfig.DATABASE_PATH)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    conn = sqlite3.connect(
+        DefaultConfig.DATABASE_PATH,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,
+        cached_statements=256
+    )
+    conn.row_factory = sqlite3.Row
+    
+    # 启用外键约束
+    conn.execute('PRAGMA foreign_keys = ON')
+    
+    # 使用WAL模式，提升调度线程与请求线程之间的读写并发
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA mmap_size = 268435456')
+    
+    return conn
+
+
 def get_db():
-    """获取数据库连接"""
-    if 'db' not in g:
-        from config import DefaultConfig
-        
-        # 确保数据库目录存在
-        db_path = Path(DefaultConfig.DATABASE_PATH)
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        g.db = sqlite3.connect(
-            DefaultConfig.DATABASE_PATH,
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        g.db.row_factory = sqlite3.Row
-        
-        # 启用外键约束
-        g.db.execute('PRAGMA foreign_keys = ON')
-        
-    return g.db
+    """获取当前线程的数据库连接"""
+    db = getattr(_local, 'db', None)
+    if db is None:
+        db = _local.db = _connect()
+    return db
 
 
 def close_db(e=None):
-    """关闭数据库连接"""
-    db = g.pop('db', None)
+    """
+    请求结束时的数据库清理
+    
+    线程本地连接在线程结束时释放，这里只回滚未提交的事务，
+    与原先关闭连接时丢弃未提交修改的行为一致
+    """
+    db = getattr(_local, 'db', None)
     
-    if db is not None:
-        db.close()
+    if db is not None and db.in_transaction:
+        db.rollback()
 
 
 def init_db():
@@ -80,10 +105,12 @@ def execute_query(query, params=None, fetch=True):
     Args:
         query: SQL查询语句
         params: 查询参数
-        fetch: 是否返回查询结果
+        fetch: 返回方式，True/'all' 返回全部结果（总是列表，无结果时为空列表），'one' 只返回第一行
+               （用于 INSERT ... RETURNING 时会提交事务），'iter' 返回游标逐行读取，
+               False 提交事务并返回 lastrowid
         
     Returns:
-        查询结果列表或None
+        查询结果列表、单行(可能为None)、可迭代游标或 lastrowid
     """
     db = get_db()
     cursor = db.cursor()
@@ -93,7 +120,14 @@ def execute_query(query, params=None, fetch=True):
     else:
         cursor.execute(query)
     
-    if fetch:
+    if fetch == 'iter':
+        return cursor
+    elif fetch == 'one':
+        row = cursor.fetchone()
+        if db.in_transaction:
+            db.commit()
+        return row
+    elif fetch:
         return cursor.fetchall()
     else:
         db.commit()
@@ -116,3 +150,109 @@ def execute_many(query, params_list):
     cursor.executemany(query, params_list)
     db.commit()
     return cursor.rowcount
+
+
+class DatabaseWriter:
+    """
+    单线程数据库写入器
+    
+    高频的状态/进度更新由各线程提交到队列，由唯一的写线程持有连接执行，
+    每个事务最多合并 BATCH_SIZE 条语句，避免多个线程争用SQLite写锁。
+    提交方阻塞等待自己的语句执行完成，保证写入后立即读取能看到结果。
+    """
+    
+    # 单个事务最多合并的语句数
+    BATCH_SIZE = 100
+    
+    _queue = SimpleQueue()
+    _thread = None
+    _start_lock = threading.Lock()
+    
+    @classmethod
+    def submit(cls, query, params=None):
+        """
+        提交写入语句并等待执行完成
+        
+        Args:
+            query: SQL语句
+            params: 语句参数
+            
+        Raises:
+            写线程执行该语句时抛出的异常
+        """
+        cls._ensure_started()
+        
+        item = {'query': query, 'params': params or (), 'done': threading.Event(), 'error': None}
+        cls._queue.put(item)
+        item['done'].wait()
+        
+        if item['error'] is not None:
+            raise item['error']
+    
+    @classmethod
+    def _ensure_started(cls):
+        """按需启动写线程"""
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+        with cls._start_lock:
+            if cls._thread is None or not cls._thread.is_alive():
+                cls._thread = threading.Thread(target=cls._run, name='db-writer', daemon=True)
+                cls._thread.start()
+    
+    @classmethod
+    def _connect(cls):
+        """创建写线程专用的数据库连接"""
+        conn = _connect()
+        # 由写线程显式控制 BEGIN/COMMIT
+        conn.isolation_level = None
+        return conn
+    
+    @classmethod
+    def _run(cls):
+        """写线程主循环：取出一批语句，在单个事务内执行"""
+        conn = None
+        while True:
+            batch = [cls._queue.get()]
+            while len(batch) < cls.BATCH_SIZE:
+                try:
+                    batch.append(cls._queue.get_nowait())
+                except Empty:
+                    break
+            
+            try:
+                if conn is None:
+                    conn = cls._connect()
+                conn.execute('BEGIN')
+                for item in batch:
+                    try:
+                        conn.execute(item['query'], item['params'])
+                    except Exception as e:
+                        item['error'] = e
+                conn.execute('COMMIT')
+            except Exception as e:
+                # 事务级失败（连接或提交失败）：通知所有提交方并重建连接
+                for item in batch:
+                    if item['error'] is None:
+                        item['error'] = e
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                conn = None
+            finally:
+                for item in batch:
+                    item['done'].set()
+
+
+def execute_write(query, params=None):
+    """
+    通过单线程写入器执行写入语句
+    
+    适用于调度线程和请求线程都会高频调用的状态/进度更新
+    
+    Args:
+        query: SQL语句
+        params: 语句参数
+    """
+    DatabaseWriter.submit(query, params)
@@ -54,10 +54,11 @@ class FileHandler:
             是否成功删除
         """
         try:
-            if os.path.exists(directory):
-                shutil.rmtree(directory)
-                logger.info(f'已删除目录: {directory}')
-                return True
+            # 直接删除，目录不存在时由异常判断，省去一次 stat
+            shutil.rmtree(directory)
+            logger.info(f'已删除目录: {directory}')
+            return True
+        except FileNotFoundError:
             return False
         except Exception as e:
             logger.error(f'删除目录失败 {directory}: {str(e)}')
@@ -0,0 +1,70 @@
+"""基于 orjson 的 Flask JSON 序列化模块"""
+from datetime import date
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+# 允许整数等非字符串字典键（与标准库 json 行为一致）；
+# 日期时间交给 _default 处理，保持 Flask 默认的 HTTP 日期格式，而不是 orjson 的 ISO-8601
+_DUMPS_OPTION = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _default(obj):
+    """
+    序列化 orjson 不直接处理的对象
+
+    Args:
+        obj: 待序列化对象
+
+    Returns:
+        可序列化的值（日期转为 HTTP 日期字符串，与 Flask 默认实现一致）
+    """
+    if isinstance(obj, date):
+        return http_date(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    使用 orjson 实现的 JSON 序列化器
+
+    替换 Flask 默认的标准库实现，jsonify 及模板 tojson 均直接输出 UTF-8，
+    中文无需转义为 \\uXXXX
+    """
+
+    def dumps(self, obj, **kwargs):
+        """
+        序列化为JSON字符串
+
+        Args:
+            obj: 待序列化对象
+
+        Returns:
+            JSON字符串
+        """
+        return orjson.dumps(obj, default=_default, option=_DUMPS_OPTION).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        """
+        反序列化JSON字符串或字节串
+
+        Args:
+            s: JSON字符串或字节串
+
+        Returns:
+            反序列化后的对象
+        """
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        生成JSON响应，直接使用 orjson 输出的字节串作为响应体
+
+        Returns:
+            Response对象
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=_DUMPS_OPTION),
+            mimetype='application/json'
+        )
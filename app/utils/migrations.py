@@ -394,6 +394,254 @@ def _migration_006_populate_audio_duration():
         logger.error(f"迭移006失败: {str(e)}", exc_info=True)
         return False
 
+def _migration_007_add_query_indexes():
+    """
+    迁移007：为常用查询添加复合索引
+    覆盖项目列表排序、运行中任务查询和临时视频片段状态查询
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        logger.info("迁移007: 开始创建复合索引...")
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_projects_created 
+            ON projects(created_at DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_projects_status 
+            ON projects(status)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_started 
+            ON tasks(status, started_at)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_project_created 
+            ON tasks(project_id, created_at DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tvs_project_status 
+            ON temp_video_segments(project_id, status)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tvs_text_segment 
+            ON temp_video_segments(text_segment_id)
+        """)
+        
+        conn.commit()
+        conn.close()
+        
+        logger.info("迁移007: 完成！成功创建复合索引")
+        return True
+        
+    except Exception as e:
+        logger.error(f"迁移007失败: {str(e)}", exc_info=True)
+        return False
+
+
+def _migration_008_add_segment_status_indexes():
+    """
+    迁移008：为段落状态查询添加复合索引
+    按 (project_id, audio_status) 过滤并按 segment_index 排序的查询可直接走索引范围扫描，
+    并在创建后执行 ANALYZE 以便查询规划器选用新索引
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        logger.info("迁移008: 开始创建段落状态复合索引...")
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_seg_proj_status_idx 
+            ON text_segments(project_id, audio_status, segment_index)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_vseg_proj_idx 
+            ON video_segments(project_id, segment_index)
+        """)
+        conn.commit()
+        
+        cursor.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+        
+        logger.info("迁移008: 完成！成功创建段落状态复合索引")
+        return True
+        
+    except Exception as e:
+        logger.error(f"迁移008失败: {str(e)}", exc_info=True)
+        return False
+
+
+def _migration_009_add_video_queue_indexes():
+    """
+    迁移009：为视频合成队列查询添加复合索引
+    按 project_id（及 status）过滤并按 video_index 排序的队列查询可直接走索引范围扫描，
+    并在创建后执行 ANALYZE 以便查询规划器选用新索引
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        logger.info("迁移009: 开始创建视频合成队列复合索引...")
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_vsq_proj_status_idx 
+            ON video_synthesis_queue(project_id, status, video_index)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_vsq_proj_idx 
+            ON video_synthesis_queue(project_id, video_index)
+        """)
+        conn.commit()
+        
+        cursor.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+        
+        logger.info("迁移009: 完成！成功创建视频合成队列复合索引")
+        return True
+        
+    except Exception as e:
+        logger.error(f"迁移009失败: {str(e)}", exc_info=True)
+        return False
+
+
+def _migration_010_create_project_stats_table():
+    """
+    迁移010：创建 project_stats 统计汇总表及维护触发器
+    段落/视频片段的插入、删除和状态变更由触发器在同一事务内增减计数，
+    项目统计接口只需读取一行；创建后按现有数据回填
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        logger.info("迁移010: 开始创建 project_stats 表及触发器...")
+        
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS project_stats (
+                project_id INTEGER PRIMARY KEY,
+                total_segments INTEGER NOT NULL DEFAULT 0,
+                completed_segments INTEGER NOT NULL DEFAULT 0,
+                pending_segments INTEGER NOT NULL DEFAULT 0,
+                failed_segments INTEGER NOT NULL DEFAULT 0,
+                total_words INTEGER NOT NULL DEFAULT 0,
+                total_video_segments INTEGER NOT NULL DEFAULT 0,
+                completed_video_segments INTEGER NOT NULL DEFAULT 0,
+                pending_video_segments INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
+            );
+
+            CREATE TRIGGER IF NOT EXISTS trg_text_segments_stats_insert AFTER INSERT ON text_segments
+            BEGIN
+                INSERT OR IGNORE INTO project_stats (project_id) VALUES (NEW.project_id);
+                UPDATE project_stats SET
+                    total_segments = total_segments + 1,
+                    completed_segments = completed_segments + (NEW.audio_status IS 'completed'),
+                    pending_segments = pending_segments + (NEW.audio_status IS 'pending'),
+                    failed_segments = failed_segments + (NEW.audio_status IS 'failed'),
+                    total_words = total_words + IFNULL(NEW.word_count, 0),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE project_id = NEW.project_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_text_segments_stats_delete AFTER DELETE ON text_segments
+            BEGIN
+                UPDATE project_stats SET
+                    total_segments = total_segments - 1,
+                    completed_segments = completed_segments - (OLD.audio_status IS 'completed'),
+                    pending_segments = pending_segments - (OLD.audio_status IS 'pending'),
+                    failed_segments = failed_segments - (OLD.audio_status IS 'failed'),
+                    total_words = total_words - IFNULL(OLD.word_count, 0),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE project_id = OLD.project_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_text_segments_stats_update AFTER UPDATE OF audio_status, word_count ON text_segments
+            WHEN OLD.audio_status IS NOT NEW.audio_status OR OLD.word_count IS NOT NEW.word_count
+            BEGIN
+                UPDATE project_stats SET
+                    completed_segments = completed_segments - (OLD.audio_status IS 'completed') + (NEW.audio_status IS 'completed'),
+                    pending_segments = pending_segments - (OLD.audio_status IS 'pending') + (NEW.audio_status IS 'pending'),
+                    failed_segments = failed_segments - (OLD.audio_status IS 'failed') + (NEW.audio_status IS 'failed'),
+                    total_words = total_words - IFNULL(OLD.word_count, 0) + IFNULL(NEW.word_count, 0),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE project_id = NEW.project_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_video_segments_stats_insert AFTER INSERT ON video_segments
+            BEGIN
+                INSERT OR IGNORE INTO project_stats (project_id) VALUES (NEW.project_id);
+                UPDATE project_stats SET
+                    total_video_segments = total_video_segments + 1,
+                    completed_video_segments = completed_video_segments + (NEW.status IS 'completed'),
+                    pending_video_segments = pending_video_segments + (NEW.status IS 'pending'),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE project_id = NEW.project_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_video_segments_stats_delete AFTER DELETE ON video_segments
+            BEGIN
+                UPDATE project_stats SET
+                    total_video_segments = total_video_segments - 1,
+                    completed_video_segments = completed_video_segments - (OLD.status IS 'completed'),
+                    pending_video_segments = pending_video_segments - (OLD.status IS 'pending'),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE project_id = OLD.project_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_video_segments_stats_update AFTER UPDATE OF status ON video_segments
+            WHEN OLD.status IS NOT NEW.status
+            BEGIN
+                UPDATE project_stats SET
+                    completed_video_segments = completed_video_segments - (OLD.status IS 'completed') + (NEW.status IS 'completed'),
+                    pending_video_segments = pending_video_segments - (OLD.status IS 'pending') + (NEW.status IS 'pending'),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE project_id = NEW.project_id;
+            END;
+        """)
+        logger.info("迁移010: 成功创建 project_stats 表及触发器")
+        
+        # 按现有数据回填统计
+        cursor.execute("""
+            INSERT OR REPLACE INTO project_stats 
+            (project_id, total_segments, completed_segments, pending_segments, failed_segments, total_words)
+            SELECT project_id, COUNT(*),
+                   SUM(audio_status IS 'completed'), SUM(audio_status IS 'pending'),
+                   SUM(audio_status IS 'failed'), IFNULL(SUM(word_count), 0)
+            FROM text_segments
+            GROUP BY project_id
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO project_stats (project_id)
+            SELECT DISTINCT project_id FROM video_segments
+        """)
+        cursor.execute("""
+            UPDATE project_stats SET
+                total_video_segments = (SELECT COUNT(*) FROM video_segments v
+                                        WHERE v.project_id = project_stats.project_id),
+                completed_video_segments = (SELECT COUNT(*) FROM video_segments v
+                                            WHERE v.project_id = project_stats.project_id
+                                            AND v.status = 'completed'),
+                pending_video_segments = (SELECT COUNT(*) FROM video_segments v
+                                          WHERE v.project_id = project_stats.project_id
+                                          AND v.status = 'pending')
+        """)
+        conn.commit()
+        conn.close()
+        
+        logger.info("迁移010: 完成！成功回填项目统计数据")
+        return True
+        
+    except Exception as e:
+        logger.error(f"迁移010失败: {str(e)}", exc_info=True)
+        return False
+
+
 def _get_migration_version():
     """
     获取数据库当前的迭移版本
@@ -494,6 +742,10 @@ def run_migrations():
             4: (_migration_004_create_temp_video_segments_table, "创建 temp_video_segments 表"),
             5: (_migration_005_create_video_synthesis_queue_table, "创建 video_synthesis_queue 表"),
             6: (_migration_006_populate_audio_duration, "为已存在的音频段落填充 audio_duration 数据"),
+            7: (_migration_007_add_query_indexes, "为常用查询添加复合索引"),
+            8: (_migration_008_add_segment_status_indexes, "为段落状态查询添加复合索引"),
+            9: (_migration_009_add_video_queue_indexes, "为视频合成队列查询添加复合索引"),
+            10: (_migration_010_create_project_stats_table, "创建 project_stats 统计汇总表"),
         }
         
         # 按版本顺序执行迁移
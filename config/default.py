@@ -23,6 +23,8 @@ class DefaultConfig:
     TEMP_AUDIO_DIR = os.path.join(TEMP_DIR, 'audio')
     TEMP_IMAGE_DIR = os.path.join(TEMP_DIR, 'images')
     TEMP_VIDEO_DIR = os.path.join(TEMP_DIR, 'video_segments')
+    TEMP_IMPORT_DIR = os.path.join(TEMP_DIR, 'imports')  # 等待后台分段的原始文本
+    JINJA_CACHE_DIR = os.path.join(TEMP_DIR, 'jinja_cache')  # 模板字节码缓存目录
     LOG_DIR = os.path.join(BASE_DIR, 'logs')
     
     # 语音参数默认值
@@ -45,6 +47,7 @@ class DefaultConfig:
     # 任务处理配置
     MAX_THREAD_COUNT = 16  # 最大线程数
     MAX_CONCURRENT_PROJECTS = 5  # 最大并发项目数
+    TASK_QUEUE_MAX_SIZE = 128  # 任务队列容量
     TTS_RETRY_COUNT = 3  # TTS失败重试次数
     
     # 资源限制
@@ -52,6 +55,10 @@ class DefaultConfig:
     MAX_VIDEO_SEGMENT_DURATION = 3600  # 单个视频片段最大时长(秒)
     MAX_TEMP_FILE_SIZE = 50 * 1024 * 1024 * 1024  # 临时文件最大占用50GB
     
+    # 缓存配置
+    DASHBOARD_STATS_CACHE_TTL = 30  # 首页统计信息缓存有效期(秒)
+    PROJECT_CACHE_SIZE = 256  # 项目对象缓存的最大条目数
+    
     # 日志配置
     LOG_LEVEL = 'INFO'
     LOG_MAX_BYTES = 10 * 1024 * 1024  # 单个日志文件最大10MB
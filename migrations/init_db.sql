@@ -89,3 +89,96 @@ CREATE INDEX IF NOT EXISTS idx_temp_video_segments_project_id ON temp_video_segm
 CREATE INDEX IF NOT EXISTS idx_temp_video_segments_status ON temp_video_segments(status);
 CREATE INDEX IF NOT EXISTS idx_video_synthesis_queue_project_id ON video_synthesis_queue(project_id);
 CREATE INDEX IF NOT EXISTS idx_video_synthesis_queue_status ON video_synthesis_queue(status);
+CREATE INDEX IF NOT EXISTS idx_projects_created ON projects(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_started ON tasks(status, started_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_created ON tasks(project_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_tvs_project_status ON temp_video_segments(project_id, status);
+CREATE INDEX IF NOT EXISTS idx_tvs_text_segment ON temp_video_segments(text_segment_id);
+CREATE INDEX IF NOT EXISTS idx_seg_proj_status_idx ON text_segments(project_id, audio_status, segment_index);
+CREATE INDEX IF NOT EXISTS idx_vseg_proj_idx ON video_segments(project_id, segment_index);
+CREATE INDEX IF NOT EXISTS idx_vsq_proj_status_idx ON video_synthesis_queue(project_id, status, video_index);
+CREATE INDEX IF NOT EXISTS idx_vsq_proj_idx ON video_synthesis_queue(project_id, video_index);
+
+-- 项目统计汇总表（由触发器随段落写入自动维护，统计接口只需读取一行）
+CREATE TABLE IF NOT EXISTS project_stats (
+    project_id INTEGER PRIMARY KEY,
+    total_segments INTEGER NOT NULL DEFAULT 0,
+    completed_segments INTEGER NOT NULL DEFAULT 0,
+    pending_segments INTEGER NOT NULL DEFAULT 0,
+    failed_segments INTEGER NOT NULL DEFAULT 0,
+    total_words INTEGER NOT NULL DEFAULT 0,
+    total_video_segments INTEGER NOT NULL DEFAULT 0,
+    completed_video_segments INTEGER NOT NULL DEFAULT 0,
+    pending_video_segments INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_text_segments_stats_insert AFTER INSERT ON text_segments
+BEGIN
+    INSERT OR IGNORE INTO project_stats (project_id) VALUES (NEW.project_id);
+    UPDATE project_stats SET
+        total_segments = total_segments + 1,
+        completed_segments = completed_segments + (NEW.audio_status IS 'completed'),
+        pending_segments = pending_segments + (NEW.audio_status IS 'pending'),
+        failed_segments = failed_segments + (NEW.audio_status IS 'failed'),
+        total_words = total_words + IFNULL(NEW.word_count, 0),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE project_id = NEW.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_text_segments_stats_delete AFTER DELETE ON text_segments
+BEGIN
+    UPDATE project_stats SET
+        total_segments = total_segments - 1,
+        completed_segments = completed_segments - (OLD.audio_status IS 'completed'),
+        pending_segments = pending_segments - (OLD.audio_status IS 'pending'),
+        failed_segments = failed_segments - (OLD.audio_status IS 'failed'),
+        total_words = total_words - IFNULL(OLD.word_count, 0),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE project_id = OLD.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_text_segments_stats_update AFTER UPDATE OF audio_status, word_count ON text_segments
+WHEN OLD.audio_status IS NOT NEW.audio_status OR OLD.word_count IS NOT NEW.word_count
+BEGIN
+    UPDATE project_stats SET
+        completed_segments = completed_segments - (OLD.audio_status IS 'completed') + (NEW.audio_status IS 'completed'),
+        pending_segments = pending_segments - (OLD.audio_status IS 'pending') + (NEW.audio_status IS 'pending'),
+        failed_segments = failed_segments - (OLD.audio_status IS 'failed') + (NEW.audio_status IS 'failed'),
+        total_words = total_words - IFNULL(OLD.word_count, 0) + IFNULL(NEW.word_count, 0),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE project_id = NEW.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_video_segments_stats_insert AFTER INSERT ON video_segments
+BEGIN
+    INSERT OR IGNORE INTO project_stats (project_id) VALUES (NEW.project_id);
+    UPDATE project_stats SET
+        total_video_segments = total_video_segments + 1,
+        completed_video_segments = completed_video_segments + (NEW.status IS 'completed'),
+        pending_video_segments = pending_video_segments + (NEW.status IS 'pending'),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE project_id = NEW.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_video_segments_stats_delete AFTER DELETE ON video_segments
+BEGIN
+    UPDATE project_stats SET
+        total_video_segments = total_video_segments - 1,
+        completed_video_segments = completed_video_segments - (OLD.status IS 'completed'),
+        pending_video_segments = pending_video_segments - (OLD.status IS 'pending'),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE project_id = OLD.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_video_segments_stats_update AFTER UPDATE OF status ON video_segments
+WHEN OLD.status IS NOT NEW.status
+BEGIN
+    UPDATE project_stats SET
+        completed_video_segments = completed_video_segments - (OLD.status IS 'completed') + (NEW.status IS 'completed'),
+        pending_video_segments = pending_video_segments - (OLD.status IS 'pending') + (NEW.status IS 'pending'),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE project_id = NEW.project_id;
+END;